@@ -10,7 +10,6 @@ import database
 import mido
 import music21
 import numpy
-import pandas
 import wavetable
 
 
@@ -208,6 +207,7 @@ class Composition:
     
     
     def convert_matrix_to_dataframe(self, matrix):
+        import pandas
         
         # Convert the unflattened Sieve to a DataFrame
         matrix = pandas.DataFrame(matrix,
@@ -297,6 +297,7 @@ if __name__ == '__main__':
     
     
     def create_dataframe(notes_data):
+        import pandas
         columns = ['Start', 'Velocity', 'Note', 'Duration', 'GridID']
         dataframe = pandas.DataFrame(notes_data, columns=columns)
         dataframe = dataframe.sort_values(by='Start').drop_duplicates().reset_index(drop=True)
@@ -432,6 +433,7 @@ if __name__ == '__main__':
     
 
     def write_midi(comp, grid_id):
+        import pandas
         midi_track = mido.MidiTrack()
         midi_track.name = f'grid_{grid_id}'
 
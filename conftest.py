@@ -0,0 +1 @@
+# Lets pytest import the sifters package from the repository root.
@@ -0,0 +1,40 @@
+TITLE = 'amen'
+
+# Every measure is evaluated over the same sixteen steps.
+SHARED_PERIOD = True
+# The original amen script used the period's largest prime factor as the numerator: 2/16 for sixteen steps.
+METER = 'largest prime factor'
+
+# The original script's clip names: the title up front, and shifts numbered by onset index from 1.
+CLIP_NAME = '{title}_{name}_{variant}'
+SHIFT_NAME = '{title}_{name}_shift_clip{n}'
+
+MEASURES = {
+    'kick m.1': '(16@0|16@2|16@10|16@11)',
+    'snare m.1': '(16@4|16@7|16@9|16@12|16@15)',
+    'closed hi hat m.1': '16@0|16@2|16@4|16@6|16@8|16@10|16@12|16@14',
+    'kick m.2': '(16@0|16@2|16@10|16@11)',
+    'snare m.2': '(16@4|16@7|16@9|16@12|16@15)',
+    'closed hi hat m.2': '(16@0|16@2|16@4|16@6|16@8|16@10|16@12|16@14)',
+    'kick m.3': '(16@0|16@2|16@10)',
+    'snare m.3': '(16@4|16@7|16@9|16@14)',
+    'closed hi hat m.3': '(16@0|16@2|16@4|16@6|16@8|16@10|16@12|16@14)',
+    'kick m.4': '(16@2|16@3|16@10)',
+    'snare m.4': '(16@1|16@4|16@7|16@9|16@14)',
+    'closed hi hat m.4': '(16@0|16@2|16@4|16@6|16@8|16@12|16@14)',
+}
+
+INSTRUMENT_CONFIGS = [
+    {
+        'name': name,
+        'sieve': sieve,
+        'velocity_profile': {'gap': 64, 'overlap': 32},
+        'duration': 'Sixteenth Note',
+        'note': 64,
+        'transformations': ['invert', 'reverse', 'stretch_2'],
+        'apply_shift': True,
+        'shift_direction': 'positive',
+        'zero_shift': True
+    }
+    for name, sieve in MEASURES.items()
+]
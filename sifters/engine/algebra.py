@@ -0,0 +1,185 @@
+import math
+
+from .sieve import Complement, Intersection, Residue, Union, as_node, format_node, normalize
+
+# simplify() gives up on an expression once a class set, or the period a
+# complement is enumerated over, grows past this many classes, or when an
+# intersection would pair up more than MAX_PAIRS classes.
+MAX_CLASSES = 1024
+MAX_PAIRS = 64 * MAX_CLASSES
+EMPTY = Residue(0, 0)
+
+
+def intersect_residues(a, b):
+    """The residue class a & b by the Chinese Remainder Theorem, or None when they never meet."""
+    if not a.modulus or not b.modulus:
+        return None
+    g = math.gcd(a.modulus, b.modulus)
+    if (b.shift - a.shift) % g:
+        return None
+    modulus = a.modulus // g * b.modulus
+    step = (b.shift - a.shift) // g * pow(a.modulus // g, -1, b.modulus // g) % (b.modulus // g)
+    return Residue(modulus, (a.shift + a.modulus * step) % modulus)
+
+
+def subsumes(outer, inner):
+    """True when every member of the class inner is a member of outer."""
+    return inner.modulus % outer.modulus == 0 and inner.shift % outer.modulus == outer.shift
+
+
+def prime_factors(n):
+    factors = []
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            factors.append(p)
+            while n % p == 0:
+                n //= p
+        p += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
+
+def reduce_classes(classes):
+    """Canonical sorted tuple for a union of classes.
+
+    Complete sets of siblings such as 8@1|8@5 are merged into their parent
+    4@1, then classes contained in a coarser member are dropped.
+    """
+    classes = {residue for residue in classes if residue.modulus}
+    if len(classes) > MAX_CLASSES:
+        raise ValueError(f"More than {MAX_CLASSES} residue classes")
+
+    merged = True
+    while merged:
+        merged = False
+        for residue in sorted(classes, key=lambda r: -r.modulus):
+            if residue not in classes:
+                continue
+            for p in prime_factors(residue.modulus):
+                parent = Residue(residue.modulus // p, residue.shift % (residue.modulus // p))
+                siblings = {Residue(residue.modulus, parent.shift + j * parent.modulus) for j in range(p)}
+                if siblings <= classes:
+                    classes = (classes - siblings) | {parent}
+                    merged = True
+                    break
+
+    ordered = sorted(classes, key=lambda r: (r.modulus, r.shift))
+    kept = []
+    for residue in ordered:
+        if not any(subsumes(outer, residue) for outer in kept):
+            kept.append(residue)
+    return tuple(kept)
+
+
+def union_classes(*class_sets):
+    return reduce_classes([residue for classes in class_sets for residue in classes])
+
+
+def intersect_classes(a, b):
+    if len(a) * len(b) > MAX_PAIRS:
+        raise ValueError(f"More than {MAX_PAIRS} pairs of residue classes")
+    return reduce_classes(filter(None, (intersect_residues(x, y) for x in a for y in b)))
+
+
+def complement_classes(classes):
+    """Classes modulo the LCM of the set that none of its members cover."""
+    modulus = math.lcm(*(residue.modulus for residue in classes))
+    if modulus > MAX_CLASSES:
+        raise ValueError(f"Complement period {modulus} exceeds {MAX_CLASSES}")
+    return reduce_classes(Residue(modulus, k) for k in range(modulus)
+                          if not any(k % residue.modulus == residue.shift for residue in classes))
+
+
+def difference_classes(a, b):
+    return intersect_classes(a, complement_classes(b))
+
+
+def residue_classes(expression):
+    """The sieve as a canonical tuple of residue classes whose union it is; raises ValueError past MAX_CLASSES."""
+    node = as_node(expression)
+    if isinstance(node, Residue):
+        return reduce_classes([node])
+    if isinstance(node, Complement):
+        return complement_classes(residue_classes(node.operand))
+
+    operands = [residue_classes(operand) for operand in node.operands]
+    classes = operands[0]
+    for other in operands[1:]:
+        if isinstance(node, Union):
+            classes = union_classes(classes, other)
+        elif isinstance(node, Intersection):
+            classes = intersect_classes(classes, other)
+        else:
+            classes = union_classes(difference_classes(classes, other), difference_classes(other, classes))
+    return classes
+
+
+def classes_to_node(classes):
+    if not classes:
+        return EMPTY
+    if len(classes) == 1:
+        return classes[0]
+    return Union(tuple(classes))
+
+
+def simplify(expression):
+    """The sieve rewritten as a flat union of residue classes, or its normalized tree when that is too large."""
+    node = normalize(as_node(expression))
+    try:
+        return classes_to_node(residue_classes(node))
+    except ValueError:
+        return node
+
+
+def is_subset(a, b):
+    return not difference_classes(a, b)
+
+
+def lint(expression):
+    """Warnings about empty and redundant terms of a sieve, as written."""
+    warnings = []
+    check_terms(as_node(expression), warnings)
+    return warnings
+
+
+def check_terms(node, warnings):
+    if isinstance(node, Residue):
+        if not node.modulus:
+            warnings.append(f"'{format_node(node)}' is empty")
+        return
+    if isinstance(node, Complement):
+        check_terms(node.operand, warnings)
+        return
+
+    try:
+        if not residue_classes(node):
+            warnings.append(f"'{format_node(node)}' is empty")
+            return
+        operands = [residue_classes(operand) for operand in node.operands]
+        kept = []
+        for index, operand in enumerate(node.operands):
+            # Compared with the terms kept so far and those still to come, so only one of a duplicate pair is flagged.
+            others = kept + operands[index + 1:]
+            if others and isinstance(node, Union):
+                redundant = is_subset(operands[index], union_classes(*others))
+            elif others and isinstance(node, Intersection):
+                redundant = is_subset(intersection_of(others), operands[index])
+            else:
+                redundant = False
+            if redundant:
+                warnings.append(f"'{format_node(operand)}' is redundant in '{format_node(node)}'")
+            else:
+                kept.append(operands[index])
+    except ValueError:
+        return
+    for operand in node.operands:
+        check_terms(operand, warnings)
+
+
+def intersection_of(class_sets):
+    classes = class_sets[0]
+    for other in class_sets[1:]:
+        classes = intersect_classes(classes, other)
+    return classes
@@ -0,0 +1,91 @@
+"""Startup benchmark for the default clip-rendering path.
+
+    python -m sifters.engine.bench [track] [--budget SECONDS] [--repeat N]
+
+Each sample runs in a fresh interpreter, so module caches from earlier samples
+do not hide import cost. The run fails when the median import time goes over
+the budget or when a heavy optional dependency is loaded on the default path.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Import time of sifters.engine.pipeline, in seconds, that the default path must stay under.
+STARTUP_BUDGET = 0.25
+HEAVY_MODULES = ('music21', 'pandas', 'mido', 'matplotlib', 'concurrent.futures', 'multiprocessing')
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+from sifters.engine import pipeline
+imported = time.perf_counter()
+rendered = imported
+if sys.argv[1]:
+    track = pipeline.load_track(sys.argv[1])
+    track.output_dir = sys.argv[2]
+    pipeline.run(track)
+    rendered = time.perf_counter()
+print(json.dumps({
+    'import': imported - start,
+    'render': rendered - imported,
+    'loaded': [name for name in sys.argv[3:] if name in sys.modules],
+}))
+'''
+
+
+def sample(track, output_dir):
+    """One fresh-interpreter run; returns the probe's timings plus the total wall time."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE, track or '', output_dir, *HEAVY_MODULES],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - start
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings['wall'] = wall
+    return timings
+
+
+def benchmark(track=None, repeat=5):
+    with tempfile.TemporaryDirectory() as output_dir:
+        samples = [sample(track, output_dir) for _ in range(repeat)]
+    return {
+        'import': statistics.median(s['import'] for s in samples),
+        'render': statistics.median(s['render'] for s in samples),
+        'wall': statistics.median(s['wall'] for s in samples),
+        'loaded': sorted(set().union(*(s['loaded'] for s in samples))),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m sifters.engine.bench', description=__doc__.splitlines()[0])
+    parser.add_argument('track', nargs='?', help="also time a full serial render of this track into a temporary directory")
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET, help="import time budget in seconds")
+    parser.add_argument('--repeat', type=int, default=5, help="fresh interpreters to sample")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    result = benchmark(args.track, args.repeat)
+
+    print(f"import sifters.engine.pipeline: {result['import'] * 1000:.1f} ms (budget {args.budget * 1000:.0f} ms)")
+    if args.track:
+        print(f"render {args.track}: {result['render'] * 1000:.1f} ms")
+    print(f"process wall time: {result['wall'] * 1000:.1f} ms")
+    print(f"heavy modules loaded: {', '.join(result['loaded']) or 'none'}")
+
+    if result['import'] > args.budget or result['loaded']:
+        print("Startup budget exceeded.")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+import json
+
+from .midi import HEADER_LENGTH, header_chunk, rename_track
+
+# A Type 1 header stores its track count in 16 bits.
+MAX_TRACKS = 0xFFFF
+
+
+class TrackBundle:
+    """Clips gathered into one Type 1 MIDI file, one named track per variant.
+
+    add() takes the bytes of a single-track clip and keeps its MTrk chunk;
+    alias() names a variant whose content is already another variant's
+    track, so its track reuses that track's events under its own name.
+    """
+
+    def __init__(self, ticks_per_beat):
+        self.ticks_per_beat = ticks_per_beat
+        self.chunks = []
+        # Track number of every variant, in track order.
+        self.tracks = {}
+        self.aliases = {}
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def add(self, name, clip):
+        self.append(name, clip[HEADER_LENGTH:])
+
+    def alias(self, name, target):
+        target = self.aliases.get(target, target)
+        if target in self.tracks:
+            self.append(name, rename_track(self.chunks[self.tracks[target]], name))
+            self.aliases[name] = target
+
+    def append(self, name, chunk):
+        if len(self.chunks) == MAX_TRACKS:
+            raise ValueError(f"A bundle holds at most {MAX_TRACKS} tracks.")
+        self.tracks[name] = len(self.chunks)
+        self.chunks.append(chunk)
+
+    def encode(self):
+        return header_chunk(len(self.chunks), self.ticks_per_beat) + b''.join(self.chunks)
+
+    def index(self):
+        """Map of every variant name to its track number and the byte offset and length of its MTrk chunk."""
+        entries = {}
+        offset = HEADER_LENGTH
+        for number, (name, chunk) in enumerate(zip(self.tracks, self.chunks)):
+            entries[name] = {'track': number, 'offset': offset, 'length': len(chunk)}
+            if name in self.aliases:
+                entries[name]['alias'] = self.aliases[name]
+            offset += len(chunk)
+        return entries
+
+    def encode_index(self):
+        return json.dumps(self.index(), indent=2).encode('utf-8')
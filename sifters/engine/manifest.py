@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import threading
+
+from .sinks import sync_directory, write_atomic
+
+MANIFEST_NAME = '.manifest.json'
+JOURNAL_NAME = '.journal.jsonl'
+
+
+def config_hash(*parts):
+    """Stable digest of an instrument config and any constants its output depends on."""
+    text = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(path, block_size=1 << 20):
+    """content_hash of a file, read a block at a time."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Config and output hashes of every clip in a track's mid/ directory.
+
+    Each entry maps a clip filename to the instrument that produced it, the
+    digest of that instrument's config and the digest of the written bytes,
+    so a re-run can skip unchanged instruments and only touch changed clips.
+    Aliases are entries for clips that were not encoded because another clip
+    has the same content; they name that clip as their target instead, and
+    write_aliases() gives them their file as a copy of it.
+
+    With journal set, every entry is also appended to a run journal once its
+    file is on disk, along with the content key of the clip when update() was
+    given one. A run that resumes reads the journal the interrupted run left
+    behind, and resume() restores its finished files instead of rendering
+    them again. close() deletes the journal after a complete run.
+    """
+
+    def __init__(self, directory, fresh=False, journal=False, resume=False):
+        self.directory = directory
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        self.entries = {}
+        self.kept = set()
+        self.written = 0
+        self.unchanged = 0
+        self.aliased = 0
+        self.resumed = 0
+        self.keys = {}
+        # Files whose bytes or entry this run changed, so the aliases of and to them are written again.
+        self.changed = set()
+        if not fresh and os.path.exists(self.path):
+            with open(self.path) as f:
+                self.entries = json.load(f)
+
+        self.journal_path = os.path.join(directory, JOURNAL_NAME)
+        self.finished = read_journal(self.journal_path) if resume else {}
+        self.verified = {}
+        self.journal = None
+        if journal:
+            self.journal = open(self.journal_path, 'a' if resume else 'w')
+            if self.journal.tell():
+                self.journal.write('\n')
+            sync_directory(directory)
+        self.lock = threading.Lock()
+
+    def instrument_files(self, instrument):
+        return [filename for filename, entry in self.entries.items() if entry['instrument'] == instrument]
+
+    def is_current(self, instrument, digest):
+        """True when every clip recorded for the instrument came from this config and is still on disk."""
+        filenames = self.instrument_files(instrument)
+        return bool(filenames) and all(
+            self.entries[filename]['config'] == digest
+            and os.path.exists(os.path.join(self.directory, filename))
+            and os.path.exists(os.path.join(self.directory, self.entries[filename].get('alias', filename)))
+            for filename in filenames
+        )
+
+    def keep_instrument(self, instrument):
+        filenames = self.instrument_files(instrument)
+        self.kept.update(filenames)
+        self.unchanged += len(filenames)
+
+    def update(self, filename, instrument, digest, data, key=None):
+        """Record a freshly encoded clip; returns True when it has to be written, after which the caller finishes it."""
+        output = content_hash(data)
+        previous = self.entries.get(filename)
+        self.entries[filename] = {'instrument': instrument, 'config': digest, 'output': output}
+        self.kept.add(filename)
+        if key is not None:
+            self.keys[filename] = key
+        if (previous is not None and previous.get('output') == output
+                and os.path.exists(os.path.join(self.directory, filename))):
+            self.unchanged += 1
+            self.finish(filename)
+            return False
+        self.written += 1
+        self.changed.add(filename)
+        return True
+
+    def record(self, filename, instrument, digest, output):
+        """Record a clip that was streamed straight to disk, given the hash of its bytes."""
+        self.entries[filename] = {'instrument': instrument, 'config': digest, 'output': output}
+        self.kept.add(filename)
+        self.written += 1
+        self.changed.add(filename)
+        self.finish(filename)
+
+    def alias(self, filename, instrument, digest, target):
+        """Record a clip that is not encoded because target has the same content."""
+        entry = {'instrument': instrument, 'config': digest, 'alias': target}
+        if self.entries.get(filename) != entry:
+            self.changed.add(filename)
+        self.entries[filename] = entry
+        self.kept.add(filename)
+        self.aliased += 1
+        self.finish(filename)
+
+    def finish(self, filename):
+        """Append the entry of a file that is now on disk to the run journal."""
+        if self.journal is None:
+            return
+        entry = dict(self.entries[filename], file=filename)
+        if filename in self.keys:
+            entry['key'] = self.keys[filename]
+        line = json.dumps(entry, sort_keys=True)
+        with self.lock:
+            self.journal.write(line + '\n')
+            self.journal.flush()
+            os.fsync(self.journal.fileno())
+
+    def resume(self, filenames, digest):
+        """Restore files the interrupted run finished from this config; False when any has to be rendered again."""
+        entries = [self.finished.get(filename) for filename in filenames]
+        if not all(entry is not None and entry['config'] == digest
+                   and self.finished_on_disk(entry.get('alias', entry['file']))
+                   for entry in entries):
+            return False
+        for filename, entry in zip(filenames, entries):
+            self.entries[filename] = {field: value for field, value in entry.items() if field not in ('file', 'key')}
+            self.kept.add(filename)
+            self.changed.add(filename)
+            self.resumed += 1
+        return True
+
+    def finished_on_disk(self, filename):
+        """True when filename holds the bytes its journal entry records, rather than an older run's file."""
+        if filename not in self.verified:
+            entry = self.finished.get(filename)
+            path = os.path.join(self.directory, filename)
+            self.verified[filename] = (entry is not None and 'output' in entry and os.path.exists(path)
+                                       and file_hash(path) == entry['output'])
+        return self.verified[filename]
+
+    def write_aliases(self, write):
+        """Give every kept alias that lacks its file, or whose entry or target changed, a file by write(target, path)."""
+        for filename in sorted(self.kept):
+            target = self.entries[filename].get('alias')
+            path = os.path.join(self.directory, filename)
+            if target is not None and (filename in self.changed or target in self.changed
+                                       or not os.path.exists(path)):
+                write(os.path.join(self.directory, target), path)
+
+    def prune(self):
+        """Delete clips that were not produced or kept by this run; returns their names."""
+        removed = []
+        for filename in sorted(os.listdir(self.directory)):
+            if filename.startswith('.') or filename in self.kept:
+                continue
+            path = os.path.join(self.directory, filename)
+            if os.path.isfile(path):
+                os.remove(path)
+                removed.append(filename)
+        self.entries = {filename: entry for filename, entry in self.entries.items() if filename in self.kept}
+        return removed
+
+    def encode(self):
+        return json.dumps(self.entries, indent=2, sort_keys=True).encode('utf-8')
+
+    def save(self):
+        write_atomic(self.path, self.encode())
+
+    def close(self, complete=True):
+        """Close the run journal, and delete it when the run completed."""
+        if self.journal is None:
+            return
+        self.journal.close()
+        if complete:
+            os.remove(self.journal_path)
+
+
+def read_journal(path):
+    """Entries of a run journal by filename, skipping a line a crash cut off."""
+    finished = {}
+    if not os.path.exists(path):
+        return finished
+    with open(path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            finished[entry['file']] = entry
+    return finished
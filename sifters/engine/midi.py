@@ -0,0 +1,174 @@
+import io
+import math
+import os
+import shutil
+import struct
+
+import numpy as np
+
+NOTE_OFF = 0x80
+NOTE_ON = 0x90
+META = 0xFF
+META_TRACK_NAME = 0x03
+META_END_OF_TRACK = 0x2F
+META_TIME_SIGNATURE = 0x58
+# Length of the MThd chunk that opens every file.
+HEADER_LENGTH = 14
+VLQ_SHIFTS = np.array([21, 14, 7, 0], dtype=np.int64)
+
+
+def encode_vlq(value):
+    """Variable-length quantity bytes for a single non-negative int."""
+    data = bytearray([value & 0x7F])
+    value >>= 7
+    while value:
+        data.insert(0, 0x80 | (value & 0x7F))
+        value >>= 7
+    return bytes(data)
+
+
+def vlq_columns(values):
+    """Four VLQ byte columns per value plus a mask of which of them are emitted."""
+    values = np.asarray(values, dtype=np.int64)
+    if np.any(values < 0) or np.any(values >= 1 << 28):
+        raise ValueError("MIDI delta times must be in [0, 2**28).")
+    columns = (values[:, None] >> VLQ_SHIFTS) & 0x7F
+    columns[:, :3] |= 0x80
+    lengths = 1 + (values >= 1 << 7) + (values >= 1 << 14) + (values >= 1 << 21)
+    emitted = np.arange(4) >= (4 - lengths)[:, None]
+    return columns, emitted
+
+
+def encode_events(deltas, statuses, data1, data2):
+    """Encode two-data-byte channel events in one pass, using running status."""
+    statuses = np.asarray(statuses, dtype=np.int64)
+    columns, emitted = vlq_columns(deltas)
+    keep_status = np.ones(len(statuses), dtype=bool)
+    keep_status[1:] = statuses[1:] != statuses[:-1]
+
+    rows = np.column_stack([columns, statuses, data1, data2]).astype(np.uint8)
+    mask = np.column_stack([emitted, keep_status, np.ones((len(statuses), 2), dtype=bool)])
+    return rows[mask].tobytes()
+
+
+def meta_event(kind, payload, delta=0):
+    return encode_vlq(delta) + bytes([META, kind]) + encode_vlq(len(payload)) + payload
+
+
+def track_name_event(name):
+    return meta_event(META_TRACK_NAME, name.encode('latin-1'))
+
+
+def time_signature_event(numerator, denominator, clocks_per_click=24, notated_32nd_notes_per_beat=8):
+    payload = bytes([numerator, int(math.log2(denominator)), clocks_per_click, notated_32nd_notes_per_beat])
+    return meta_event(META_TIME_SIGNATURE, payload)
+
+
+def end_of_track_event():
+    return meta_event(META_END_OF_TRACK, b'')
+
+
+def header_chunk(track_count, ticks_per_beat, midi_format=1):
+    return b'MThd' + struct.pack('>IHHH', 6, midi_format, track_count, ticks_per_beat)
+
+
+def track_chunk(data):
+    return b'MTrk' + struct.pack('>I', len(data)) + data
+
+
+def note_events(binary, velocities, note, step_ticks, channel=0, previous=-1):
+    """One note_on/note_off pair per onset, each note lasting one step and rests folded into the next note_on.
+
+    previous is the step of the last onset before binary, relative to its
+    start, so a clip can be encoded chunk by chunk.
+    """
+    onsets = np.flatnonzero(binary)
+    previous = np.concatenate([[previous], onsets[:-1]])
+
+    count = len(onsets)
+    deltas = np.empty(2 * count, dtype=np.int64)
+    deltas[0::2] = (onsets - previous - 1) * step_ticks
+    deltas[1::2] = step_ticks
+    statuses = np.tile([NOTE_ON | channel, NOTE_OFF | channel], count)
+    notes = np.full(2 * count, note)
+    levels = np.zeros(2 * count, dtype=np.int64)
+    levels[0::2] = np.asarray(velocities)[onsets]
+    return encode_events(deltas, statuses, notes, levels)
+
+
+def clip_template(time_signature, ticks_per_beat):
+    """The bytes every clip of an instrument shares: (header and MTrk tag, time signature, end of track).
+
+    Only the track name and the note events differ between variants, so
+    they are all that fill_template encodes per clip.
+    """
+    numerator, denominator = time_signature
+    return (header_chunk(1, ticks_per_beat) + b'MTrk', time_signature_event(numerator, denominator),
+            end_of_track_event())
+
+
+def fill_template(template, name, events):
+    """A clip's bytes from its instrument's template, its name and its encoded note events."""
+    head, meta, tail = template
+    name_event = track_name_event(name)
+    length = len(name_event) + len(meta) + len(events) + len(tail)
+    return b''.join([head, struct.pack('>I', length), name_event, meta, events, tail])
+
+
+def read_name_event(f):
+    """Read the track name event a track opens with, as every clip here does, from the binary file f."""
+    event = f.read(3)
+    if event != bytes([0, META, META_TRACK_NAME]):
+        raise ValueError("The track does not open with its name.")
+    length, byte = 0, 0x80
+    while byte & 0x80:
+        byte = f.read(1)[0]
+        event += bytes([byte])
+        length = length << 7 | byte & 0x7F
+    return event + f.read(length)
+
+
+def rename_track(chunk, name):
+    """An MTrk chunk under another track name; its other events are reused as they are."""
+    f = io.BytesIO(chunk)
+    f.seek(8)
+    read_name_event(f)
+    return track_chunk(track_name_event(name) + f.read())
+
+
+def copy_renamed(source, target, name, block_size=1 << 20):
+    """Copy a clip between binary files under another track name, a block at a time, so it is never re-encoded."""
+    head = source.read(HEADER_LENGTH + 8)
+    previous = read_name_event(source)
+    name_event = track_name_event(name)
+    length = struct.unpack('>I', head[-4:])[0] - len(previous) + len(name_event)
+    target.write(head[:-4] + struct.pack('>I', length) + name_event)
+    shutil.copyfileobj(source, target, block_size)
+
+
+def stream_clip(f, chunks, note, step_ticks, name, template):
+    """Write a clip to the binary file f from (binary, velocities) chunks and return its audible note count.
+
+    Only one chunk is held at a time. The MTrk length is written as a
+    placeholder and patched once the end of track is known.
+    """
+    head, meta, tail = template
+    f.write(head)
+    length_position = f.tell()
+    f.write(bytes(4))
+    size = f.write(track_name_event(name) + meta)
+
+    offset, previous, audible = 0, -1, 0
+    for binary, velocities in chunks:
+        size += f.write(note_events(binary, velocities, note, step_ticks, previous=previous - offset))
+        onsets = np.flatnonzero(binary)
+        if len(onsets):
+            previous = offset + int(onsets[-1])
+        audible += np.count_nonzero(velocities)
+        offset += len(binary)
+    size += f.write(tail)
+
+    f.seek(length_position)
+    f.write(struct.pack('>I', size))
+    f.seek(0, os.SEEK_END)
+    return audible
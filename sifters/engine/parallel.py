@@ -0,0 +1,73 @@
+import numpy as np
+
+ALIGNMENT = 64
+WORKER_STATE = {}
+# Workers are started from a clean server process rather than forked from
+# the caller, which by then runs the output writer threads.
+START_METHODS = ('forkserver', 'spawn')
+
+
+def pack_shared(arrays):
+    """Copy named arrays into one shared-memory block and return it with the layout to view them."""
+    from multiprocessing import shared_memory
+
+    layout = {}
+    size = 0
+    for name, array in arrays.items():
+        array = np.asarray(array)
+        layout[name] = (size, array.shape, array.dtype.str)
+        size += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for name, array in arrays.items():
+        view_shared(block.buf, layout[name])[...] = array
+    return block, layout
+
+
+def view_shared(buffer, entry):
+    offset, shape, dtype = entry
+    return np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+
+
+def initialize_worker(render, context, block_name, layout):
+    from multiprocessing import shared_memory
+
+    block = shared_memory.SharedMemory(name=block_name)
+    arrays = {name: view_shared(block.buf, entry) for name, entry in layout.items()}
+    for array in arrays.values():
+        array.flags.writeable = False
+    WORKER_STATE.update(render=render, context=context, block=block, arrays=arrays)
+
+
+def render_in_worker(unit):
+    return WORKER_STATE['render'](WORKER_STATE['context'], WORKER_STATE['arrays'], unit)
+
+
+def render_units(render, context, arrays, units, jobs=1):
+    """Yield render(context, arrays, unit) for every unit, in submission order.
+
+    With jobs > 1 the units run on a process pool. The context is pickled once
+    per worker and the arrays are shared through a single shared-memory block,
+    so each task only ships its small unit tuple. The pool machinery is only
+    imported when it is used, which keeps it off the serial startup path.
+    """
+    units = list(units)
+    if jobs <= 1 or len(units) <= 1:
+        for unit in units:
+            yield render(context, arrays, unit)
+        return
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    method = next(method for method in START_METHODS if method in multiprocessing.get_all_start_methods())
+    block, layout = pack_shared(arrays)
+    try:
+        initargs = (render, context, block.name, layout)
+        with ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context(method),
+                                 initializer=initialize_worker, initargs=initargs) as pool:
+            chunksize = max(1, len(units) // (jobs * 4))
+            yield from pool.map(render_in_worker, units, chunksize=chunksize)
+    finally:
+        block.close()
+        block.unlink()
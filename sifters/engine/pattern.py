@@ -0,0 +1,153 @@
+import numpy as np
+
+WORD_BITS = 64
+BIT_REVERSE = np.array([int(f'{i:08b}'[::-1], 2) for i in range(256)], dtype=np.uint8)
+
+
+def word_count(length):
+    return -(-length // WORD_BITS)
+
+
+def trimmed(words, length):
+    """Clear the bits past length in the last word, which every Pattern keeps at zero."""
+    remainder = length % WORD_BITS
+    if remainder and len(words):
+        words[-1] &= np.uint64((1 << remainder) - 1)
+    return words
+
+
+def shift_up(words, amount):
+    """Move every bit from position i to i + amount across the word array."""
+    quotient, remainder = divmod(amount, WORD_BITS)
+    shifted = np.zeros_like(words)
+    if quotient >= len(words):
+        return shifted
+    source = words[:len(words) - quotient]
+    shifted[quotient:] = source << remainder
+    if remainder:
+        shifted[quotient + 1:] |= source[:-1] >> (WORD_BITS - remainder)
+    return shifted
+
+
+def shift_down(words, amount):
+    """Move every bit from position i to i - amount, dropping bits below zero."""
+    quotient, remainder = divmod(amount, WORD_BITS)
+    shifted = np.zeros_like(words)
+    if quotient >= len(words):
+        return shifted
+    source = words[quotient:]
+    shifted[:len(source)] = source >> remainder
+    if remainder:
+        shifted[:len(source) - 1] |= source[1:] << (WORD_BITS - remainder)
+    return shifted
+
+
+class Pattern:
+    """A rhythm binary packed into little-endian uint64 words, bit i being step i.
+
+    The words are used as given, so a Pattern can wrap a read-only buffer
+    such as shared memory; the bits past length must already be zero.
+    """
+
+    __slots__ = ('words', 'length')
+
+    def __init__(self, words, length):
+        self.words = words
+        self.length = length
+
+    @classmethod
+    def zeros(cls, length):
+        return cls(np.zeros(word_count(length), dtype='<u8'), length)
+
+    @classmethod
+    def from_binary(cls, binary):
+        packed = np.packbits(np.asarray(binary) != 0, bitorder='little')
+        buffer = np.zeros(word_count(len(binary)) * 8, dtype=np.uint8)
+        buffer[:len(packed)] = packed
+        return cls(buffer.view('<u8'), len(binary))
+
+    def to_binary(self):
+        """Unpack into the int array layout used by sieve_to_binary."""
+        bits = np.unpackbits(self.words.view(np.uint8), count=self.length, bitorder='little')
+        return bits.astype(int)
+
+    def nonzero(self):
+        return np.flatnonzero(self.to_binary())
+
+    def popcount(self):
+        return int(np.bitwise_count(self.words).sum())
+
+    def overlap(self, other):
+        """Number of steps set in both patterns, counted a word at a time."""
+        self._check_length(other)
+        return int(np.bitwise_count(self.words & other.words).sum())
+
+    def shift(self, amount):
+        """Rotate like np.roll(binary, amount)."""
+        if not self.length:
+            return self.copy()
+        amount %= self.length
+        words = shift_up(self.words, amount) | shift_down(self.words, self.length - amount)
+        return Pattern(trimmed(words, self.length), self.length)
+
+    def invert(self):
+        return Pattern(trimmed(~self.words, self.length), self.length)
+
+    def reverse(self):
+        flipped = BIT_REVERSE[self.words.view(np.uint8)[::-1]].view('<u8')
+        padding = len(self.words) * WORD_BITS - self.length
+        return Pattern(shift_down(flipped, padding), self.length)
+
+    def stretch(self, factor):
+        return Pattern.from_binary(np.repeat(self.to_binary(), factor))
+
+    def copy(self):
+        return Pattern(self.words.copy(), self.length)
+
+    def _check_length(self, other):
+        if self.length != other.length:
+            raise ValueError(f"Pattern lengths differ: {self.length} != {other.length}")
+
+    def __and__(self, other):
+        self._check_length(other)
+        return Pattern(self.words & other.words, self.length)
+
+    def __or__(self, other):
+        self._check_length(other)
+        return Pattern(self.words | other.words, self.length)
+
+    def __xor__(self, other):
+        self._check_length(other)
+        return Pattern(self.words ^ other.words, self.length)
+
+    def __invert__(self):
+        return self.invert()
+
+    def __getitem__(self, index):
+        """Bit at step index, or an int array of them for an array of indices, wrapping like arr[i % len(arr)]."""
+        index = np.asarray(index, dtype=np.int64)
+        if not self.length:
+            if index.size:
+                raise IndexError("Pattern index out of range: the pattern is empty.")
+            return index.astype(int)
+        index = index % self.length
+        bits = (self.words[index // WORD_BITS] >> (index % WORD_BITS).astype(np.uint64)) & np.uint64(1)
+        return bits.astype(int) if bits.ndim else int(bits)
+
+    def __len__(self):
+        return self.length
+
+    def __eq__(self, other):
+        if not isinstance(other, Pattern):
+            return NotImplemented
+        return self.length == other.length and np.array_equal(self.words, other.words)
+
+    def __hash__(self):
+        return hash((self.length, self.words.tobytes()))
+
+    def __repr__(self):
+        return f"Pattern({''.join(map(str, self.to_binary()))})"
+
+    @property
+    def nbytes(self):
+        return self.words.nbytes
@@ -0,0 +1,702 @@
+import argparse
+import functools
+import glob
+import hashlib
+import importlib.util
+import os
+
+import numpy as np
+
+from .bundle import TrackBundle
+from .manifest import MANIFEST_NAME, Manifest, config_hash, file_hash
+from .midi import clip_template, copy_renamed, fill_template, note_events, stream_clip
+from .algebra import lint, prime_factors
+from .parallel import render_units
+from .pattern import Pattern
+from .planner import SievePlan, config_expressions
+from .shifts import distinct_shifts, rotation_period, shift_amounts
+from .sinks import SINKS, clear_temporary, open_atomic, open_sink, replace_synced, temporary_path
+from .sieve import cache_stats, clear_caches, music21_binary, period as sieve_period, sieve_to_binary
+from .streaming import MAX_NUMERATOR, bar_steps, segment_rotation_period, stream_shift_amounts, variant_chunks
+from .transformations import chain_name, chain_view, parse_chain
+from .velocity import apply_levels, step_levels
+from .view import PatternView
+
+TRACKS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TICKS_PER_QUARTER_NOTE = 480
+
+DURATION_MULTIPLIER_KEY = {
+    'Whole Note': 4,
+    'Half Note': 2,
+    'Quarter Note': 1,
+    'Eighth Note': 0.5,
+    'Sixteenth Note': 0.25,
+    'Thirty-Second Note': 0.125,
+}
+
+DURATION_TO_DENOMINATOR = {
+    'Whole Note': 1,
+    'Half Note': 2,
+    'Quarter Note': 4,
+    'Eighth Note': 8,
+    'Sixteenth Note': 16,
+    'Thirty-Second Note': 16  # This stays 16; generate_time_signature halves the numerator
+}
+
+# Used when an instrument has neither accents nor its own velocity_profile.
+DEFAULT_VELOCITY_PROFILE = {'gap': 80, 'overlap': 127}
+
+# Rules for a clip's time-signature numerator, chosen by a track's METER.
+METERS = ('period', 'largest prime factor')
+
+# Clip names of transformations and of shifts. A track's CLIP_NAME and SHIFT_NAME
+# may use {title} and {name}, plus {variant} for the transformation chain, or
+# {shift} for the signed amount and {n} for the amount plus one.
+CLIP_NAME = '{name}_{variant}'
+SHIFT_NAME = '{name}_shift({shift:+})'
+
+
+class Track:
+    """Settings of one track, read from the module-level names of its config.py.
+
+    Only INSTRUMENT_CONFIGS is required; TITLE, OUTPUT_DIR, TICKS_PER_QUARTER_NOTE,
+    the duration tables, SHARED_PERIOD, METER, CLIP_NAME and SHIFT_NAME fall back
+    to the engine defaults.
+    """
+
+    def __init__(self, config, directory):
+        self.directory = directory
+        self.title = getattr(config, 'TITLE', os.path.basename(directory))
+        self.output_dir = getattr(config, 'OUTPUT_DIR', os.path.join(directory, 'mid', ''))
+        self.ticks_per_quarter_note = getattr(config, 'TICKS_PER_QUARTER_NOTE', TICKS_PER_QUARTER_NOTE)
+        self.duration_multipliers = getattr(config, 'DURATION_MULTIPLIER_KEY', DURATION_MULTIPLIER_KEY)
+        self.duration_denominators = getattr(config, 'DURATION_TO_DENOMINATOR', DURATION_TO_DENOMINATOR)
+        # Evaluate every instrument over the largest period in the track instead of its own.
+        self.shared_period = getattr(config, 'SHARED_PERIOD', False)
+        # Time-signature numerator: the period itself, or its largest prime factor.
+        self.meter = getattr(config, 'METER', 'period')
+        if self.meter not in METERS:
+            raise ValueError(f"Unknown METER {self.meter!r}; expected one of {', '.join(map(repr, METERS))}.")
+        self.clip_name = getattr(config, 'CLIP_NAME', CLIP_NAME)
+        self.shift_name = getattr(config, 'SHIFT_NAME', SHIFT_NAME)
+        try:
+            self.clip_name.format(title='', name='', variant='')
+            self.shift_name.format(title='', name='', shift=0, n=1)
+        except (KeyError, IndexError, ValueError) as e:
+            raise ValueError(f"Invalid CLIP_NAME or SHIFT_NAME: {e!r}") from e
+        self.instrument_configs = config.INSTRUMENT_CONFIGS
+        # Swapped for music21_binary by --music21; the native evaluator is the default.
+        self.to_binary = sieve_to_binary
+        # SievePlan per period and the masks it evaluated, filled in by plan_sieves.
+        self.sieve_plans = {}
+        self.sieve_masks = {}
+
+
+def load_track(name):
+    """Load a track by its directory name under sifters/ or by a path to its directory."""
+    directory = os.path.abspath(name if os.path.isdir(name) else os.path.join(TRACKS_DIR, name))
+    path = os.path.join(directory, 'config.py')
+    if not os.path.exists(path):
+        raise ValueError(f"No config.py found for track {name!r} in {directory}")
+
+    spec = importlib.util.spec_from_file_location(f'sifters_{os.path.basename(directory)}_config', path)
+    config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config)
+    track = Track(config, directory)
+    for warning in lint_track(track):
+        print(f"Warning: {warning}")
+    return track
+
+
+def lint_track(track):
+    """Empty and redundant sieve terms in the track's instruments and accents."""
+    warnings = []
+    for config in track.instrument_configs:
+        instrument_name = config.get('name', 'unnamed')
+        for expression in config_expressions(config):
+            warnings += [f"{instrument_name}: {warning}" for warning in lint(expression)]
+    return warnings
+
+
+def ensure_directory(path):
+    os.makedirs(path, exist_ok=True)
+
+
+def clear_directory(path, keep=()):
+    """Delete the files of path, except hidden ones and those in keep; returns their names."""
+    removed = []
+    for file_path in sorted(glob.glob(os.path.join(path, '*'))):
+        if os.path.basename(file_path) not in keep and os.path.isfile(file_path):
+            os.remove(file_path)
+            removed.append(os.path.basename(file_path))
+    return removed
+
+
+def get_duration_multiplier(track, duration_name):
+    return track.duration_multipliers.get(duration_name, 0.25)
+
+
+def generate_time_signature(track, period, duration):
+    if period > MAX_NUMERATOR:
+        raise ValueError(f"The period {period} exceeds {MAX_NUMERATOR}.")
+    numerator = period
+    if track.meter == 'largest prime factor':
+        numerator = max(prime_factors(period), default=1)
+    if duration == 'Thirty-Second Note':
+        return max(1, numerator // 2), track.duration_denominators.get(duration, 16)
+    return numerator, track.duration_denominators.get(duration, 16)
+
+
+def beat_steps(track, duration):
+    """Steps in one beat of the time signature's denominator: two for thirty-second notes over 16, else one."""
+    beat = 4 / track.duration_denominators.get(duration, 16)
+    return max(1, round(beat / get_duration_multiplier(track, duration)))
+
+
+def streamed_time_signature(track, period, duration):
+    """Bar length in steps and time signature of a long clip, with a whole number of beats in each bar.
+
+    A period with no such bar is counted in its own steps instead, over a
+    denominator scaled to match.
+    """
+    unit = beat_steps(track, duration)
+    denominator = track.duration_denominators.get(duration, 16)
+    bar = bar_steps(period, unit)
+    if bar is None:
+        unit, denominator = 1, denominator * unit
+        bar = bar_steps(period)
+    numerator = bar // unit
+    if track.meter == 'largest prime factor':
+        numerator = max(prime_factors(numerator), default=1)
+    return bar, (numerator, denominator)
+
+
+def create_accent_binaries(accent_dict, period, to_binary=sieve_to_binary):
+    binaries = {}
+    for label, pattern in accent_dict.items():
+        binaries[label] = to_binary(pattern, period)
+    return binaries
+
+
+def generate_velocity_profile(accent_dict, print_profile=False):
+    if not accent_dict:
+        return dict(DEFAULT_VELOCITY_PROFILE)
+
+    num_levels = len(accent_dict)
+    gap = 1
+    overlap = 127
+    step = (overlap - gap) // (num_levels + 1)
+
+    profile = {'gap': gap, 'overlap': overlap}
+    for i, label in enumerate(accent_dict.keys()):
+        profile[label] = gap + step * (i + 1)
+
+    if print_profile:
+        print("Generated velocity profile:")
+        for k, v in profile.items():
+            print(f"  {k}: {v}")
+
+    return profile
+
+
+def create_midi(binary, filename, velocities, note, step_ticks, template):
+    """Encoded clip bytes from the instrument's clip template, or None when there are no notes to play."""
+    if not np.any(binary) or not np.any(velocities):
+        return None
+    return fill_template(template, filename, note_events(binary, velocities, note, step_ticks))
+
+
+def instrument_periods(track):
+    periods = [sieve_period(config['sieve']) for config in track.instrument_configs]
+    if track.shared_period and periods:
+        return [max(periods)] * len(periods)
+    return periods
+
+
+def plan_sieves(track, instruments):
+    """Evaluate each distinct node of the instruments' sieves and accents once per period."""
+    expressions = {}
+    for config, period in instruments:
+        expressions.setdefault(period, []).extend(config_expressions(config))
+    for period, period_expressions in expressions.items():
+        track.sieve_plans[period] = SievePlan(period_expressions)
+        track.sieve_masks[period] = track.sieve_plans[period].evaluate(0, period)
+
+
+def sieve_binary(track, expression, period):
+    """Pattern of a sieve over [0, period), from the track's plan when it holds one."""
+    mask = track.sieve_masks.get(period, {}).get(expression)
+    if mask is None:
+        mask = track.to_binary(expression, period)
+    return Pattern.from_binary(mask)
+
+
+def is_streamed(period):
+    """Periods too long for a one-bar clip are rendered bar by bar instead of in memory."""
+    return period > MAX_NUMERATOR
+
+
+def instrument_profile(config):
+    accent_dict = config.get('accent_dict', {})
+    return config.get('velocity_profile') or generate_velocity_profile(accent_dict, print_profile=bool(accent_dict))
+
+
+def clip_context(track, config, time_signature):
+    """Settings shared by every clip of an instrument."""
+    duration = config.get('duration', 'Quarter Note')
+    return {
+        'title': track.title,
+        'name': config.get('name', 'unnamed'),
+        'clip_name': track.clip_name,
+        'shift_name': track.shift_name,
+        'note': config.get('note', 64),
+        'step_ticks': int(track.ticks_per_quarter_note * get_duration_multiplier(track, duration)),
+        'ticks_per_beat': track.ticks_per_quarter_note,
+        'time_signature': time_signature,
+        'template': clip_template(time_signature, track.ticks_per_quarter_note),
+        'rotate_accents': config.get('rotate_accents', True),
+    }
+
+
+def plan_instrument(track, config, period):
+    """Evaluate an instrument once and list its variants as work units.
+
+    The base binary and the accent layers are held as Patterns; the base is
+    shipped to the renderers as its packed words, with the period in the context.
+    """
+    base = sieve_binary(track, config['sieve'], period)
+    base_binary = base.to_binary()
+
+    accent_dict = config.get('accent_dict', {})
+    accent_binaries = create_accent_binaries(accent_dict, period, functools.partial(sieve_binary, track))
+    levels = step_levels(accent_binaries, instrument_profile(config), period)
+
+    time_signature = generate_time_signature(track, period, config.get('duration', 'Quarter Note'))
+    context = clip_context(track, config, time_signature)
+    context['period'] = period
+    arrays = {
+        'binary': base.words,
+        'levels': levels,
+        'velocities': apply_levels(base_binary, levels),
+    }
+
+    variants = ['prime'] + config.get('transformations', [])
+    context['aliases'] = {}
+    if config.get('apply_shift', False):
+        shifts = shift_amounts(base_binary, config.get('shift_direction', 'positive'), config.get('zero_shift', False))
+        # With rotated accents a clip is a rotation of both arrays, otherwise of the binary alone.
+        key = arrays['velocities'] * 2 + base_binary if context['rotate_accents'] else base_binary
+        shifts, context['aliases'] = distinct_shifts(shifts, rotation_period(key))
+        variants += shifts
+    return context, arrays, named_variants(context, variants)
+
+
+def plan_streamed_instrument(track, config, period):
+    """Context and variants of a long-period instrument; nothing period-sized is evaluated up front."""
+    bar, time_signature = streamed_time_signature(track, period, config.get('duration', 'Quarter Note'))
+    context = clip_context(track, config, time_signature)
+    context.update(
+        sieve=config['sieve'],
+        accents=config.get('accent_dict', {}),
+        profile=instrument_profile(config),
+        period=period,
+        bar=bar,
+        output_dir=track.output_dir,
+    )
+
+    variants = ['prime'] + config.get('transformations', [])
+    context['aliases'] = {}
+    if config.get('apply_shift', False):
+        shifts = stream_shift_amounts(config['sieve'], period, config.get('shift_direction', 'positive'),
+                                      config.get('zero_shift', False))
+        expressions = [config['sieve']]
+        if context['rotate_accents']:
+            expressions += context['accents'].values()
+        shifts, context['aliases'] = distinct_shifts(shifts, segment_rotation_period(expressions, period))
+        variants += shifts
+    return context, named_variants(context, variants)
+
+
+def named_variants(context, variants):
+    """The variants that parse and have a clip name of their own; the others are reported and dropped."""
+    instrument_name = context['name']
+    kept, names = [], {}
+    for variant in variants:
+        if isinstance(variant, str):
+            try:
+                parse_chain(variant)
+            except ValueError as e:
+                print(f"Skipping transformation {variant} for {instrument_name}: {e}")
+                continue
+        filename = variant_filename(context, variant)
+        if filename in names:
+            print(f"Warning: {instrument_name}: {variant!r} would overwrite the clip of {names[filename]!r}; skipped.")
+            continue
+        names[filename] = variant
+        kept.append(variant)
+    return kept
+
+
+def variant_filename(context, variant):
+    """Clip name of a variant, from its track's CLIP_NAME or, for a shift amount, SHIFT_NAME."""
+    if isinstance(variant, str):
+        return context['clip_name'].format(title=context['title'], name=context['name'], variant=chain_name(variant))
+    return context['shift_name'].format(title=context['title'], name=context['name'], shift=variant, n=variant + 1)
+
+
+def record_aliases(manifest, context):
+    """Record the skipped shifts of an instrument whose target clip was written or kept."""
+    for variant, target in context['aliases'].items():
+        target_file = f"{variant_filename(context, target)}.mid"
+        if target_file in manifest.kept:
+            target_file = manifest.entries[target_file].get('alias', target_file)
+            manifest.alias(f"{variant_filename(context, variant)}.mid", context['name'],
+                           context['digest'], target_file)
+
+
+def write_alias(target, path):
+    """Write an alias as a copy of its target clip under the alias's own track name."""
+    with open(target, 'rb') as source, open_atomic(path) as f:
+        copy_renamed(source, f, os.path.basename(path)[:-len('.mid')])
+
+
+def clip_key(binary, velocities, clip_args):
+    """Digest of what a clip plays (onsets, velocities, note and timing), leaving out its name.
+
+    The onsets are hashed as a packed Pattern and the velocities only where
+    they sound, since rests are always silent.
+    """
+    pattern = Pattern.from_binary(binary)
+    digest = hashlib.sha256(repr((clip_args, len(pattern))).encode('utf-8'))
+    digest.update(pattern.words.tobytes())
+    digest.update(np.asarray(velocities, dtype=np.int64)[np.asarray(binary) != 0].tobytes())
+    return digest.hexdigest()
+
+
+def render_variant(contexts, arrays, unit):
+    """Build one (instrument, variant) clip; returns (filename, data, message, content key)."""
+    index, variant = unit
+    context = contexts[index]
+    instrument_name = context['name']
+    base_binary = Pattern(arrays[f'{index}.binary'], context['period'])
+    levels = arrays[f'{index}.levels']
+    clip_args = (context['note'], context['step_ticks'], context['time_signature'], context['ticks_per_beat'])
+    encode_args = (context['note'], context['step_ticks'], context['template'])
+
+    filename = variant_filename(context, variant)
+    # Variants are views over the shared base arrays; they are only gathered here, right before encoding.
+    if isinstance(variant, str):
+        try:
+            transformed_binary = chain_view(parse_chain(variant), len(base_binary)).take(base_binary)
+            velocities = apply_levels(transformed_binary, levels)
+            data = create_midi(transformed_binary, filename, velocities, *encode_args)
+            key = clip_key(transformed_binary, velocities, clip_args)
+        except Exception as e:
+            return filename, None, f"Skipping transformation {variant} for {instrument_name}: {e}", None
+    else:
+        # Rolling the binary and its accents together rolls the velocities,
+        # so one rolled view serves both base arrays.
+        view = PatternView(len(base_binary)).rolled(variant)
+        shifted = view.take(base_binary)
+        if context['rotate_accents']:
+            velocities = view.take(arrays[f'{index}.velocities'])
+        else:
+            velocities = apply_levels(shifted, levels)
+        data = create_midi(shifted, filename, velocities, *encode_args)
+        key = clip_key(shifted, velocities, clip_args)
+
+    if data is None:
+        return filename, None, f"Skipping {filename}: no notes to play.", None
+    return filename, data, None, key
+
+
+def stream_variant(contexts, arrays, unit):
+    """Stream one long (instrument, variant) clip to disk; returns (filename, output hash, message)."""
+    index, variant = unit
+    context = contexts[index]
+    filename = variant_filename(context, variant)
+    path = os.path.join(context['output_dir'], f"{filename}.mid")
+    temporary = temporary_path(path)
+
+    try:
+        with open(temporary, 'wb') as f:
+            audible = stream_clip(f, variant_chunks(context, variant), context['note'], context['step_ticks'],
+                                  filename, context['template'])
+            f.flush()
+            os.fsync(f.fileno())
+    except Exception as e:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        return filename, None, f"Skipping {filename}: {e}"
+    if not audible:
+        os.remove(temporary)
+        return filename, None, f"Skipping {filename}: no notes to play."
+    replace_synced(temporary, path)
+    return filename, file_hash(path), None
+
+
+def instrument_digest(track, config, period, bundle=None, bundle_index=False):
+    """Digest of everything an instrument's outputs depend on, including the bundle layout they are written in."""
+    parts = [config, period, track.ticks_per_quarter_note, track.duration_multipliers, track.duration_denominators]
+    if track.meter != 'period':
+        parts.append({'meter': track.meter})
+    if (track.clip_name, track.shift_name) != (CLIP_NAME, SHIFT_NAME):
+        parts.append({'clip_name': track.clip_name, 'shift_name': track.shift_name})
+    # Streamed clips are always loose files, whatever the layout.
+    if bundle and not is_streamed(period):
+        parts.append({'bundle': bundle, 'bundle_index': bundle_index})
+    return config_hash(*parts)
+
+
+def bundle_owners(track, contexts, bundle):
+    """(bundle name, digest) of each instrument's bundle; the name is also its owner in the manifest."""
+    if bundle == 'track':
+        digest = config_hash(*(context['digest'] for context in contexts))
+        return [(track.title, digest)] * len(contexts)
+    return [(context['name'], context['digest']) for context in contexts]
+
+
+def pending_instruments(track, manifest, bundle=None, bundle_index=False):
+    """(config, period, digest) of every instrument to render; the clips of the others are kept."""
+    instruments = [(config, period, instrument_digest(track, config, period, bundle, bundle_index))
+                   for config, period in zip(track.instrument_configs, instrument_periods(track))]
+    pending = []
+    for config, period, digest in instruments:
+        if bundle == 'track' and not is_streamed(period):
+            continue
+        if manifest.is_current(config.get('name', 'unnamed'), digest):
+            manifest.keep_instrument(config.get('name', 'unnamed'))
+        else:
+            pending.append((config, period, digest))
+
+    if bundle == 'track':
+        # A track bundle holds every in-memory instrument, so it is kept or re-rendered as a whole.
+        bundled = [instrument for instrument in instruments if not is_streamed(instrument[1])]
+        digest = config_hash(*(instrument_digest for _, _, instrument_digest in bundled))
+        if bundled and manifest.is_current(track.title, digest):
+            manifest.keep_instrument(track.title)
+        else:
+            pending += bundled
+    return pending
+
+
+def process_instruments(track, manifest, sink, jobs=1, bundle=None, bundle_index=False):
+    pending = pending_instruments(track, manifest, bundle, bundle_index)
+
+    streamed = [instrument for instrument in pending if is_streamed(instrument[1])]
+    pending = [instrument for instrument in pending if not is_streamed(instrument[1])]
+    if streamed:
+        process_streamed_instruments(track, manifest, sink, streamed, jobs)
+
+    if track.to_binary is sieve_to_binary:
+        plan_sieves(track, [(config, period) for config, period, _ in pending])
+
+    contexts, arrays, units = [], {}, []
+    for config, period, digest in pending:
+        index = len(contexts)
+        context, instrument_arrays, variants = plan_instrument(track, config, period)
+        context['digest'] = digest
+        contexts.append(context)
+        arrays.update({f'{index}.{key}': value for key, value in instrument_arrays.items()})
+        units += [(index, variant) for variant in variants]
+    owners = bundle_owners(track, contexts, bundle)
+
+    # Per-run content-addressed store: the first clip of an instrument with a
+    # given content is written, later ones are aliased to it. Keys are scoped to
+    # the instrument so an incremental run never keeps an alias into a clip
+    # that another instrument's re-render has changed.
+    store = {}
+    units = unfinished_units(manifest, contexts, units, owners if bundle else None, bundle_index, store)
+    bundles = {}
+    results = render_units(render_variant, contexts, arrays, units, jobs)
+    for (index, _), (filename, data, message, key) in zip(units, results):
+        # Units come grouped by bundle, so a bundle is saved as soon as the next one starts.
+        for owner in [owner for owner in bundles if owner != owners[index]]:
+            finish_bundle(manifest, sink, contexts, owners, owner, bundles.pop(owner), bundle_index)
+        if message:
+            print(message)
+        if data is None:
+            continue
+        context = contexts[index]
+        target = store.setdefault((index, key), filename)
+        if bundle:
+            clips = bundles.setdefault(owners[index], TrackBundle(context['ticks_per_beat']))
+            if target != filename:
+                clips.alias(filename, target)
+            else:
+                clips.add(filename, data)
+        elif target != filename:
+            manifest.alias(f"{filename}.mid", context['name'], context['digest'], f"{target}.mid")
+        elif manifest.update(f"{filename}.mid", context['name'], context['digest'], data, key):
+            sink.write(f"{filename}.mid", data, functools.partial(manifest.finish, f"{filename}.mid"))
+
+    for owner, clips in bundles.items():
+        finish_bundle(manifest, sink, contexts, owners, owner, clips, bundle_index)
+    if not bundle:
+        for context in contexts:
+            record_aliases(manifest, context)
+
+
+def finish_bundle(manifest, sink, contexts, owners, owner, clips, bundle_index=False):
+    """Point the skipped shifts of a bundle's instruments at their targets' tracks, then save the bundle."""
+    for index, context in enumerate(contexts):
+        if owners[index] == owner:
+            for variant, target in context['aliases'].items():
+                clips.alias(variant_filename(context, variant), variant_filename(context, target))
+    save_bundle(manifest, sink, *owner, clips, bundle_index)
+
+
+def bundle_files(name, bundle_index=False):
+    return [f"{name}.mid"] + ([f"{name}.index.json"] if bundle_index else [])
+
+
+def unfinished_units(manifest, contexts, units, owners=None, bundle_index=False, store=None):
+    """The units whose files a resumed run still lacks; the files of the rest are restored from the journal.
+
+    Bundles are only written whole, so with owners their units are resumed
+    a bundle at a time. With store, the content keys of the restored clips
+    are added to it, so their duplicates are aliased to them as in a fresh run.
+    """
+    if not manifest.finished:
+        return units
+    if owners is not None:
+        done = {owner for owner in set(owners) if manifest.resume(bundle_files(owner[0], bundle_index), owner[1])}
+        return [unit for unit in units if owners[unit[0]] not in done]
+    unfinished = []
+    for index, variant in units:
+        filename = variant_filename(contexts[index], variant)
+        if not manifest.resume([f"{filename}.mid"], contexts[index]['digest']):
+            unfinished.append((index, variant))
+        elif store is not None and 'key' in manifest.finished[f"{filename}.mid"]:
+            store[(index, manifest.finished[f"{filename}.mid"]['key'])] = filename
+    return unfinished
+
+
+def save_bundle(manifest, sink, name, digest, clips, bundle_index=False):
+    """Write a bundle, and its index as a JSON sidecar when asked, under the bundle's name."""
+    outputs = [clips.encode()] + ([clips.encode_index()] if bundle_index else [])
+    manifest.aliased += len(clips.aliases)
+    for filename, data in zip(bundle_files(name, bundle_index), outputs):
+        if manifest.update(filename, name, digest, data):
+            sink.write(filename, data, functools.partial(manifest.finish, filename))
+
+
+def process_streamed_instruments(track, manifest, sink, instruments, jobs=1):
+    contexts, units = [], []
+    for config, period, digest in instruments:
+        if track.to_binary is not sieve_to_binary:
+            print(f"Warning: {config.get('name', 'unnamed')}: period {period} is streamed with the built-in "
+                  f"evaluator; --music21 only applies to periods up to {MAX_NUMERATOR}.")
+        context, variants = plan_streamed_instrument(track, config, period)
+        context['digest'] = digest
+        units += [(len(contexts), variant) for variant in variants]
+        contexts.append(context)
+    units = unfinished_units(manifest, contexts, units)
+
+    results = render_units(stream_variant, contexts, {}, units, jobs)
+    for (index, _), (filename, output, message) in zip(units, results):
+        if message:
+            print(message)
+        if output is not None:
+            context = contexts[index]
+            manifest.record(f"{filename}.mid", context['name'], context['digest'], output)
+            sink.add_file(f"{filename}.mid", os.path.join(track.output_dir, f"{filename}.mid"))
+    for context in contexts:
+        record_aliases(manifest, context)
+
+
+def validate_configs(track):
+    for config, period in zip(track.instrument_configs, instrument_periods(track)):
+        if not is_streamed(period):
+            generate_time_signature(track, period, config.get('duration', 'Quarter Note'))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m sifters.engine', description="Render a track's clips.")
+    parser.add_argument('track', help="track directory name under sifters/, or a path to a directory with a config.py")
+    parser.add_argument('--jobs', type=int, default=1, help="worker processes for rendering variants")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only write new or changed clips and delete stale ones, using the manifest in OUTPUT_DIR")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue an interrupted run with the same options, keeping the clips its journal "
+                             "records as finished")
+    parser.add_argument('--music21', action='store_true',
+                        help="evaluate sieves with music21 instead of the built-in evaluator (slow; needs music21; "
+                             "streamed periods over 255 steps still use the built-in one)")
+    parser.add_argument('--bundle', choices=['instrument', 'track'],
+                        help="write the variants of each instrument, or of the whole track, as the tracks of one "
+                             "Type 1 MIDI file instead of one file per clip")
+    parser.add_argument('--bundle-index', action='store_true',
+                        help="with --bundle, also write NAME.index.json mapping each variant to the byte offset "
+                             "of its track")
+    parser.add_argument('--sink', choices=SINKS, default='files',
+                        help="write loose files into OUTPUT_DIR (the default), or every file into one "
+                             "TITLE.zip or TITLE.tar archive there")
+    parser.add_argument('--writers', type=int, default=1,
+                        help="threads writing output while clips are encoded; 0 writes inline (archives use one)")
+    parser.add_argument('--compress', action='store_true', help="deflate zip members, or gzip the tar archive")
+    parser.add_argument('--cache-stats', action='store_true', help="print hit and miss counts of the sieve caches")
+    args = parser.parse_args(argv)
+    if (args.incremental or args.resume) and args.sink != 'files':
+        parser.error("--incremental and --resume only work with --sink files")
+    return args
+
+
+def print_cache_stats(track):
+    for period, plan in sorted(track.sieve_plans.items()):
+        print(f"period {period}: {plan.summary()}")
+    for name, info in cache_stats().items():
+        print(f"{name} cache: {info.hits} hits, {info.misses} misses, {info.currsize}/{info.maxsize} entries")
+
+
+def run(track, jobs=1, incremental=False, music21=False, bundle=None, bundle_index=False, sink='files',
+        compress=False, writers=1, resume=False):
+    """Render the track's clips into its output directory.
+
+    Every file is written under a temporary name and renamed into place, and
+    the previous outputs are only pruned once the run has completed, so an
+    interrupted run leaves the old clips alongside whole new ones. Loose-file
+    runs keep a journal of the files they finished for a later --resume.
+    """
+    if music21:
+        track.to_binary = music21_binary
+    # Masks are keyed by z-range, which differs between tracks, so a run starts from empty caches.
+    clear_caches()
+    validate_configs(track)
+    ensure_directory(track.output_dir)
+    clear_temporary(track.output_dir)
+
+    manifest = Manifest(track.output_dir, fresh=not incremental, journal=sink == 'files', resume=resume)
+    sink = open_sink(sink, track.output_dir, track.title, compress, writers)
+    try:
+        try:
+            process_instruments(track, manifest, sink, jobs, bundle, bundle_index)
+            if sink.archive:
+                # An archive is rewritten whole, so its manifest travels inside it.
+                sink.write(MANIFEST_NAME, manifest.encode())
+        except BaseException:
+            sink.close(complete=False)
+            raise
+        # Closing waits for the writer threads and raises the first write that failed.
+        sink.close()
+    except BaseException:
+        manifest.close(complete=False)
+        raise
+    if sink.archive:
+        removed = clear_directory(track.output_dir, keep=[os.path.basename(sink.archive)])
+    else:
+        manifest.write_aliases(write_alias)
+        removed = manifest.prune()
+        manifest.save()
+    manifest.close()
+    print(f"Wrote {manifest.written} clips, copied {manifest.aliased} duplicates instead of encoding them, "
+          f"kept {manifest.unchanged} unchanged, resumed {manifest.resumed}, removed {len(removed)} stale.")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    track = load_track(args.track)
+    run(track, args.jobs, args.incremental, args.music21, args.bundle, args.bundle_index, args.sink, args.compress,
+        args.writers, args.resume)
+    if args.cache_stats:
+        print_cache_stats(track)
@@ -0,0 +1,96 @@
+import numpy as np
+
+from .algebra import simplify
+from .sieve import Residue, Union, children, evaluate_node, parse
+
+
+def config_expressions(config):
+    """Every sieve string an instrument config evaluates: its sieve and its accents."""
+    return [config['sieve'], *config.get('accent_dict', {}).values()]
+
+
+def flat_classes(node):
+    """The residue classes of a simplified node, or None when it did not reduce to a flat union."""
+    if isinstance(node, Residue):
+        return (node,)
+    if isinstance(node, Union) and all(isinstance(operand, Residue) for operand in node.operands):
+        return node.operands
+    return None
+
+
+def evaluate_many(expressions, start, stop):
+    """(N, stop - start) boolean matrix of N sieves over one z-range.
+
+    The sieves are simplified to unions of residue classes and the classes
+    are grouped by modulus: each modulus gets an (N, modulus) membership
+    table, and one gather through the z-range's residues fills every row
+    that uses it. Sieves too large to simplify are evaluated on their own.
+    """
+    nodes = [simplify(expression) for expression in expressions]
+    matrix = np.zeros((len(nodes), stop - start), dtype=bool)
+    tables = {}
+    for row, node in enumerate(nodes):
+        classes = flat_classes(node)
+        if classes is None:
+            matrix[row] = evaluate_node(node, start, stop)
+            continue
+        for residue in classes:
+            if residue.modulus:
+                table = tables.setdefault(residue.modulus, np.zeros((len(nodes), residue.modulus), dtype=bool))
+                table[row, residue.shift] = True
+
+    steps = np.arange(stop - start, dtype=np.int64)
+    for modulus, table in tables.items():
+        rows = np.flatnonzero(table.any(axis=1))
+        matrix[rows] |= table[rows][:, (steps + start % modulus) % modulus]
+    return matrix
+
+
+def count_nodes(node):
+    return 1 + sum(count_nodes(child) for child in children(node))
+
+
+class SievePlan:
+    """One expression DAG shared by a set of sieve strings.
+
+    Every string is simplified to a union of residue classes (or, past the
+    algebra's size limits, normalized), so equal classes and subtrees
+    anywhere in the set collapse to a single node. evaluate() runs the
+    distinct roots through evaluate_many, so each residue class is
+    evaluated once per z-range and each distinct sieve once.
+    """
+
+    def __init__(self, expressions):
+        self.roots = {}
+        self.nodes = {}
+        self.total_nodes = 0
+        for expression in expressions:
+            if expression in self.roots:
+                continue
+            tree = parse(expression)
+            self.total_nodes += count_nodes(tree)
+            self.roots[expression] = simplify(tree)
+            self.add(self.roots[expression])
+
+    def add(self, node):
+        if node in self.nodes:
+            return
+        for child in children(node):
+            self.add(child)
+        self.nodes[node] = len(self.nodes)
+
+    @property
+    def residues(self):
+        return [node for node in self.nodes if isinstance(node, Residue)]
+
+    def evaluate(self, start, stop):
+        """Masks of every expression over [start, stop), keyed by the original strings."""
+        roots = list(dict.fromkeys(self.roots.values()))
+        matrix = evaluate_many(roots, start, stop)
+        matrix.flags.writeable = False
+        rows = {root: matrix[row] for row, root in enumerate(roots)}
+        return {expression: rows[root] for expression, root in self.roots.items()}
+
+    def summary(self):
+        return (f"{len(self.roots)} sieves, {self.total_nodes} nodes as written, "
+                f"{len(self.nodes)} unique ({len(self.residues)} residue classes)")
@@ -0,0 +1,143 @@
+import bisect
+import heapq
+
+import numpy as np
+
+from .sieve import Complement, Intersection, Residue, Union, as_node, compute_mask, normalize, period
+
+# Above this many candidate steps per period the gap table is not built and
+# queries merge the candidate classes lazily instead. Sieves without a finite
+# cover are scanned SCAN_CHUNK steps at a time.
+MAX_GAP_TABLE = 1 << 20
+SCAN_CHUNK = 1 << 16
+
+
+def contains(node, t):
+    """Membership of a single integer, by modular arithmetic on the tree."""
+    if isinstance(node, Residue):
+        return bool(node.modulus) and t % node.modulus == node.shift
+    if isinstance(node, Complement):
+        return not contains(node.operand, t)
+    results = (contains(operand, t) for operand in node.operands)
+    if isinstance(node, Intersection):
+        return all(results)
+    if isinstance(node, Union):
+        return any(results)
+    return sum(results) % 2 == 1
+
+
+def contains_many(node, values):
+    """contains() over an int array at once."""
+    if isinstance(node, Residue):
+        if not node.modulus:
+            return np.zeros(len(values), dtype=bool)
+        return values % node.modulus == node.shift
+    if isinstance(node, Complement):
+        return ~contains_many(node.operand, values)
+    masks = [contains_many(operand, values) for operand in node.operands]
+    if isinstance(node, Intersection):
+        return np.logical_and.reduce(masks)
+    if isinstance(node, Union):
+        return np.logical_or.reduce(masks)
+    return np.logical_xor.reduce(masks)
+
+
+def candidate_classes(node):
+    """Residue classes that cover every onset of the node, or None when a complement leaves it unbounded.
+
+    &, | and ^ never produce an onset outside their operands, so a union or
+    difference is covered by its operands' classes and an intersection by the
+    sparsest of its bounded operands.
+    """
+    if isinstance(node, Residue):
+        return frozenset([node]) if node.modulus else frozenset()
+    if isinstance(node, Complement):
+        return None
+    covers = [candidate_classes(operand) for operand in node.operands]
+    if isinstance(node, Intersection):
+        bounded = [cover for cover in covers if cover is not None]
+        if not bounded:
+            return None
+        return min(bounded, key=lambda cover: sum(1 / residue.modulus for residue in cover))
+    if any(cover is None for cover in covers):
+        return None
+    return frozenset().union(*covers)
+
+
+class SieveQuery:
+    """Point and range queries on a sieve over all integers, without materializing [0, period).
+
+    When the onsets are covered by a manageable set of residue classes, the
+    onsets of one period are enumerated from those classes and kept as a
+    sorted offset table with the gap to each next onset, so next_onset is a
+    bisection and onsets_in walks the gaps. When one period holds too many
+    candidates the classes are merged lazily from the query point instead,
+    and sieves with unbounded complements fall back to scanning uncached
+    masks in chunks.
+    """
+
+    def __init__(self, expression):
+        self.node = normalize(as_node(expression))
+        self.period = period(self.node)
+        self.offsets = None
+        self.gaps = None
+
+        self.classes = candidate_classes(self.node)
+        if self.classes is not None and sum(self.period // r.modulus for r in self.classes) <= MAX_GAP_TABLE:
+            candidates = np.unique(np.concatenate(
+                [np.arange(residue.shift, self.period, residue.modulus, dtype=np.int64) for residue in self.classes]
+                or [np.empty(0, dtype=np.int64)]))
+            offsets = candidates[contains_many(self.node, candidates)]
+            self.offsets = offsets.tolist()
+            self.gaps = np.diff(offsets, append=offsets[:1] + self.period).tolist()
+
+    def contains(self, t):
+        return contains(self.node, t)
+
+    def next_onset(self, t):
+        """Smallest onset >= t, or None when the sieve is empty."""
+        if self.offsets is None:
+            return next(self.walk(t, t + self.period), None)
+        if not self.offsets:
+            return None
+        base, offset = divmod(t, self.period)
+        index = bisect.bisect_left(self.offsets, offset)
+        if index == len(self.offsets):
+            return (base + 1) * self.period + self.offsets[0]
+        return base * self.period + self.offsets[index]
+
+    def onsets_in(self, a, b):
+        """Yield every onset in [a, b) in increasing order."""
+        if self.offsets is None:
+            yield from self.walk(a, b)
+            return
+        onset = self.next_onset(a)
+        if onset is None:
+            return
+        index = bisect.bisect_left(self.offsets, onset % self.period)
+        while onset < b:
+            yield onset
+            onset += self.gaps[index]
+            index = (index + 1) % len(self.offsets)
+
+    def walk(self, a, b):
+        """Onsets in [a, b) from merging the candidate classes in order, or from a scan without them."""
+        if self.classes is None:
+            yield from self.scan(a, b)
+            return
+        heap = [(a + (residue.shift - a) % residue.modulus, residue.modulus) for residue in self.classes]
+        heapq.heapify(heap)
+        previous = None
+        while heap and heap[0][0] < b:
+            candidate, modulus = heap[0]
+            heapq.heapreplace(heap, (candidate + modulus, modulus))
+            if candidate != previous and contains(self.node, candidate):
+                yield candidate
+            previous = candidate
+
+    def scan(self, a, b):
+        # Uncached, like streaming: one-off windows would only churn the mask cache.
+        for start in range(a, b, SCAN_CHUNK):
+            stop = min(start + SCAN_CHUNK, b)
+            for offset in np.flatnonzero(compute_mask(self.node, start, stop)).tolist():
+                yield start + offset
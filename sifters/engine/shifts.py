@@ -0,0 +1,54 @@
+import numpy as np
+
+
+def shift_amounts(binary, direction='positive', zero=False):
+    """Roll amounts for every non-zero onset index, ordered as s, -s for 'both'.
+
+    With zero, an onset at index 0 also gives a roll of 0, once, ahead of the others.
+    """
+    indices = np.flatnonzero(binary)
+    head = indices[:int(zero and len(indices) and indices[0] == 0)]
+    indices = indices[indices != 0]
+    if direction == 'positive':
+        return np.concatenate([head, indices])
+    if direction == 'negative':
+        return np.concatenate([head, -indices])
+    if direction == 'both':
+        return np.concatenate([head, np.column_stack([indices, -indices]).ravel()])
+    return indices[:0]
+
+
+def rotation_period(sequence):
+    """Smallest q > 0 with np.roll(sequence, q) equal to sequence, from the KMP failure function."""
+    sequence = np.asarray(sequence).tolist()
+    n = len(sequence)
+    if not n:
+        return 1
+    failure = [0] * n
+    k = 0
+    for i in range(1, n):
+        while k and sequence[i] != sequence[k]:
+            k = failure[k - 1]
+        if sequence[i] == sequence[k]:
+            k += 1
+        failure[i] = k
+    q = n - failure[-1]
+    return q if n % q == 0 else n
+
+
+def distinct_shifts(amounts, q):
+    """Split shift amounts into the ones that give distinct rotations and a map of the rest.
+
+    With a rotation period of q, shifts congruent mod q give the same clip, and
+    a shift that is a multiple of q gives the unshifted one. The map sends each
+    skipped amount to the first kept amount it repeats, or to 'prime'.
+    """
+    kept, aliases, first = [], {}, {0: 'prime'}
+    for amount in amounts:
+        amount = int(amount)
+        if amount % q in first:
+            aliases[amount] = first[amount % q]
+        else:
+            first[amount % q] = amount
+            kept.append(amount)
+    return kept, aliases
@@ -0,0 +1,277 @@
+import functools
+import math
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+# Residue-class grammar, with Python's operator precedence as used by music21:
+#   expr    := xor ('|' xor)*
+#   xor     := and ('^' and)*
+#   and     := unary ('&' unary)*
+#   unary   := '-' unary | atom
+#   atom    := residue | '(' expr ')'
+#   residue := INT ('@' INT)?
+TOKEN_PATTERN = re.compile(r'\s*(?:(\d+)|(.))')
+OPERATORS = '|^&-@()'
+
+# Bounds of the LRU caches behind parse(), normalize(), period() and
+# evaluate(). A cached mask costs one byte per step, so the default holds a
+# few MB for the periods used here.
+PARSE_CACHE_SIZE = 1024
+MASK_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class Residue:
+    modulus: int
+    shift: int
+
+
+@dataclass(frozen=True)
+class Complement:
+    operand: object
+
+
+@dataclass(frozen=True)
+class Intersection:
+    operands: tuple
+
+
+@dataclass(frozen=True)
+class Union:
+    operands: tuple
+
+
+@dataclass(frozen=True)
+class SymmetricDifference:
+    operands: tuple
+
+
+REDUCERS = {
+    Intersection: np.logical_and,
+    Union: np.logical_or,
+    SymmetricDifference: np.logical_xor,
+}
+
+SYMBOLS = {
+    Intersection: '&',
+    Union: '|',
+    SymmetricDifference: '^',
+}
+
+
+def tokenize(expression):
+    tokens = []
+    for number, symbol in TOKEN_PATTERN.findall(expression.strip()):
+        if number:
+            tokens.append(int(number))
+        elif symbol in OPERATORS:
+            tokens.append(symbol)
+        else:
+            raise ValueError(f"Unexpected character {symbol!r} in sieve {expression!r}")
+    return tokens
+
+
+class Parser:
+    def __init__(self, expression):
+        self.expression = expression
+        self.tokens = tokenize(expression)
+        self.position = 0
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def take(self):
+        token = self.peek()
+        if token is None:
+            raise ValueError(f"Unexpected end of sieve {self.expression!r}")
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("Empty sieve expression")
+        node = self.parse_binary(Union, '|', self.parse_xor)
+        if self.peek() is not None:
+            raise ValueError(f"Unexpected {self.peek()!r} in sieve {self.expression!r}")
+        return node
+
+    def parse_binary(self, node_type, symbol, parse_operand):
+        operands = [parse_operand()]
+        while self.peek() == symbol:
+            self.take()
+            operands.append(parse_operand())
+        if len(operands) == 1:
+            return operands[0]
+        return node_type(tuple(operands))
+
+    def parse_xor(self):
+        return self.parse_binary(SymmetricDifference, '^', self.parse_and)
+
+    def parse_and(self):
+        return self.parse_binary(Intersection, '&', self.parse_unary)
+
+    def parse_unary(self):
+        if self.peek() == '-':
+            self.take()
+            return Complement(self.parse_unary())
+        return self.parse_atom()
+
+    def parse_atom(self):
+        token = self.take()
+        if token == '(':
+            node = self.parse_binary(Union, '|', self.parse_xor)
+            if self.take() != ')':
+                raise ValueError(f"Unbalanced parentheses in sieve {self.expression!r}")
+            return node
+        if not isinstance(token, int):
+            raise ValueError(f"Unexpected {token!r} in sieve {self.expression!r}")
+        shift = 0
+        if self.peek() == '@':
+            self.take()
+            shift = self.take()
+            if not isinstance(shift, int):
+                raise ValueError(f"Expected a shift after '@' in sieve {self.expression!r}")
+        return Residue(token, shift % token if token else shift)
+
+
+def parse(expression):
+    """Parse a residue-class sieve string such as '(8@0|8@1)&5@3' into an expression tree."""
+    return parse_normalized(''.join(expression.split()))
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_normalized(expression):
+    return Parser(expression).parse()
+
+
+def as_node(expression):
+    if isinstance(expression, str):
+        return parse(expression)
+    return expression
+
+
+def children(node):
+    if isinstance(node, Residue):
+        return ()
+    if isinstance(node, Complement):
+        return (node.operand,)
+    return node.operands
+
+
+def format_node(node):
+    """Sieve string for an expression tree; n-ary operands are always parenthesized."""
+    if isinstance(node, Residue):
+        return f'{node.modulus}@{node.shift}'
+    if isinstance(node, Complement):
+        operand = format_node(node.operand)
+        return f'-{operand}' if isinstance(node.operand, (Residue, Complement)) else f'-({operand})'
+    parts = [format_node(operand) if isinstance(operand, (Residue, Complement)) else f'({format_node(operand)})'
+             for operand in node.operands]
+    return SYMBOLS[type(node)].join(parts)
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def normalize(node):
+    """Canonical form of a tree, so equivalent spellings share one cache entry.
+
+    Nested operators of the same kind are flattened, the operands of |, & and ^
+    are sorted, duplicate operands of | and & are dropped (they are idempotent;
+    ^ is not) and double complements cancel.
+    """
+    node = as_node(node)
+    if isinstance(node, Residue):
+        return node
+    if isinstance(node, Complement):
+        operand = normalize(node.operand)
+        return operand.operand if isinstance(operand, Complement) else Complement(operand)
+
+    operands = []
+    for operand in map(normalize, node.operands):
+        operands.extend(operand.operands if type(operand) is type(node) else [operand])
+    if not isinstance(node, SymmetricDifference):
+        operands = list(dict.fromkeys(operands))
+    if len(operands) == 1:
+        return operands[0]
+    return type(node)(tuple(sorted(operands, key=format_node)))
+
+
+def moduli(expression):
+    """Distinct non-zero moduli of the residue classes in the expression."""
+    node = as_node(expression)
+    if isinstance(node, Residue):
+        return frozenset([node.modulus]) if node.modulus else frozenset()
+    if isinstance(node, Complement):
+        return moduli(node.operand)
+    return frozenset().union(*(moduli(operand) for operand in node.operands))
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def period(expression):
+    """Period of the sieve as the LCM of its moduli, without evaluating it."""
+    return math.lcm(*moduli(expression))
+
+
+def evaluate(expression, start, stop):
+    """Return a read-only boolean mask of the sieve over the integers [start, stop)."""
+    return evaluate_node(normalize(as_node(expression)), start, stop)
+
+
+@functools.lru_cache(maxsize=MASK_CACHE_SIZE)
+def evaluate_node(node, start, stop):
+    """Masks are memoized per (node, z-range), so subtrees shared between sieves are evaluated once."""
+    mask = compute_mask(node, start, stop, evaluate_node)
+    mask.flags.writeable = False
+    return mask
+
+
+def compute_mask(node, start, stop, evaluate_operand=None):
+    """Fresh mask of a node over [start, stop), with operands evaluated by evaluate_operand.
+
+    Without evaluate_operand the whole tree is evaluated uncached, which is
+    what streaming uses so that one-off windows do not churn the mask cache.
+    """
+    evaluate_operand = evaluate_operand or compute_mask
+    if isinstance(node, Residue):
+        mask = np.zeros(stop - start, dtype=bool)
+        if node.modulus:
+            mask[(node.shift - start) % node.modulus::node.modulus] = True
+        return mask
+    if isinstance(node, Complement):
+        return ~evaluate_operand(node.operand, start, stop)
+
+    reducer = REDUCERS[type(node)]
+    mask = reducer(evaluate_operand(node.operands[0], start, stop), evaluate_operand(node.operands[1], start, stop))
+    for operand in node.operands[2:]:
+        reducer(mask, evaluate_operand(operand, start, stop), out=mask)
+    return mask
+
+
+def cache_stats():
+    """Hit and miss counts of the parse and mask caches."""
+    return {'parse': parse_normalized.cache_info(), 'mask': evaluate_node.cache_info()}
+
+
+def clear_caches():
+    """Empty every sieve cache, along with its hit and miss counts."""
+    parse_normalized.cache_clear()
+    normalize.cache_clear()
+    evaluate_node.cache_clear()
+    period.cache_clear()
+
+
+def sieve_to_binary(expression, period):
+    """Binary segment over [0, period), matching music21's segment(segmentFormat='binary')."""
+    return evaluate(expression, 0, period).astype(int)
+
+
+def music21_binary(expression, period):
+    """The same segment computed by music21, imported only when this compatibility path is used."""
+    from music21 import sieve
+
+    reference = sieve.Sieve(expression)
+    reference.setZRange(0, period - 1)
+    return np.array(reference.segment(segmentFormat='binary'), dtype=int)
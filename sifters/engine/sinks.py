@@ -0,0 +1,216 @@
+import contextlib
+import io
+import os
+import queue
+import tarfile
+import threading
+import time
+import zipfile
+
+SINKS = ('files', 'zip', 'tar')
+# Writes a QueuedSink holds before the producer blocks.
+QUEUE_DEPTH = 64
+TEMPORARY_SUFFIX = '.tmp'
+
+
+def temporary_path(path):
+    """Hidden sibling of path that a write goes to before it is renamed into place."""
+    directory, filename = os.path.split(path)
+    return os.path.join(directory, f".{filename}{TEMPORARY_SUFFIX}")
+
+
+@contextlib.contextmanager
+def open_atomic(path):
+    """A binary file whose bytes replace path once the block exits; a crash leaves either the old file or the new one.
+
+    The data is synced to disk before the rename and the directory after it,
+    so once the block exits a power loss can neither drop the new bytes nor
+    bring back the old file under the name. An error leaves path untouched.
+    """
+    temporary = temporary_path(path)
+    try:
+        with open(temporary, 'wb') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    replace_synced(temporary, path)
+
+
+def write_atomic(path, data):
+    with open_atomic(path) as f:
+        f.write(data)
+
+
+def replace_synced(source, path):
+    """Rename source to path and sync the directory, so the rename itself survives a power loss."""
+    os.replace(source, path)
+    sync_directory(os.path.dirname(path))
+
+
+def sync_file(path):
+    with open(path, 'rb') as f:
+        os.fsync(f.fileno())
+
+
+def sync_directory(path):
+    descriptor = os.open(path or '.', os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def clear_temporary(directory):
+    """Delete writes an interrupted run left unfinished."""
+    for filename in os.listdir(directory):
+        if filename.startswith('.') and filename.endswith(TEMPORARY_SUFFIX):
+            os.remove(os.path.join(directory, filename))
+
+
+class DirectorySink:
+    """Every clip as its own file in the output directory."""
+
+    archive = None
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def write(self, filename, data, done=None):
+        """Write a file atomically, then call done() when given; a failed write is reported and raised."""
+        try:
+            write_atomic(os.path.join(self.directory, filename), data)
+        except Exception as e:
+            print(f"Error saving {filename}: {e}")
+            raise
+        if done is not None:
+            done()
+
+    def add_file(self, filename, path):
+        """Take in a clip that was streamed to path in the output directory; a loose file is already in place."""
+
+    def close(self, complete=True):
+        pass
+
+
+class ZipSink:
+    """Every clip as a member of one zip archive, stored or deflated."""
+
+    def __init__(self, path, compress=False):
+        self.archive = path
+        self.file = zipfile.ZipFile(temporary_path(path), 'w',
+                                    zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED)
+
+    def write(self, filename, data, done=None):
+        self.file.writestr(filename, data)
+        if done is not None:
+            done()
+
+    def add_file(self, filename, path):
+        self.file.write(path, filename)
+        os.remove(path)
+
+    def close(self, complete=True):
+        finish_archive(self.file, self.archive, complete)
+
+
+class TarSink:
+    """Every clip as a member of one tar archive, optionally gzipped."""
+
+    def __init__(self, path, compress=False):
+        self.archive = path
+        self.file = tarfile.open(temporary_path(path), 'w:gz' if compress else 'w')
+
+    def write(self, filename, data, done=None):
+        info = tarfile.TarInfo(filename)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        self.file.addfile(info, io.BytesIO(data))
+        if done is not None:
+            done()
+
+    def add_file(self, filename, path):
+        self.file.add(path, filename)
+        os.remove(path)
+
+    def close(self, complete=True):
+        finish_archive(self.file, self.archive, complete)
+
+
+def finish_archive(file, path, complete):
+    """Close an archive built under its temporary name and move it into place, or drop it after a failed run."""
+    file.close()
+    if complete:
+        sync_file(temporary_path(path))
+        replace_synced(temporary_path(path), path)
+    else:
+        os.remove(temporary_path(path))
+
+
+class QueuedSink:
+    """Another sink's writes, run on writer threads fed through a bounded queue.
+
+    write() and add_file() return as soon as the write is queued, so encoding
+    overlaps with disk latency; once depth writes are waiting they block
+    until a writer catches up. close() drains the queue, closes the wrapped
+    sink and re-raises the first error a writer hit.
+    """
+
+    def __init__(self, sink, writers=1, depth=QUEUE_DEPTH):
+        self.sink = sink
+        self.archive = sink.archive
+        self.queue = queue.Queue(depth)
+        self.errors = []
+        self.threads = [threading.Thread(target=self.drain, daemon=True) for _ in range(writers)]
+        for thread in self.threads:
+            thread.start()
+
+    def drain(self):
+        while True:
+            task = self.queue.get()
+            try:
+                if task is None:
+                    return
+                method, args = task
+                method(*args)
+            except Exception as e:
+                self.errors.append(e)
+            finally:
+                self.queue.task_done()
+
+    def write(self, filename, data, done=None):
+        self.queue.put((self.sink.write, (filename, data, done)))
+
+    def add_file(self, filename, path):
+        self.queue.put((self.sink.add_file, (filename, path)))
+
+    def close(self, complete=True):
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.sink.close(complete and not self.errors)
+        if self.errors:
+            raise self.errors[0]
+
+
+def open_sink(kind, directory, name, compress=False, writers=1):
+    """The sink for one run: loose files in directory, or the archive name.zip, name.tar or name.tar.gz there.
+
+    With writers > 0 the writes run on that many background threads; an
+    archive is appended to in order, so it always gets a single writer.
+    """
+    if kind == 'zip':
+        sink = ZipSink(os.path.join(directory, f"{name}.zip"), compress)
+    elif kind == 'tar':
+        sink = TarSink(os.path.join(directory, f"{name}.tar.gz" if compress else f"{name}.tar"), compress)
+    elif kind == 'files':
+        sink = DirectorySink(directory)
+    else:
+        raise ValueError(f"Unknown sink {kind!r}; expected one of {', '.join(SINKS)}.")
+    if writers <= 0:
+        return sink
+    return QueuedSink(sink, 1 if sink.archive else writers)
@@ -0,0 +1,100 @@
+import math
+
+import numpy as np
+
+from .algebra import simplify
+from .query import SieveQuery, contains_many
+from .sieve import compute_mask, period as sieve_period
+from .transformations import chain_view, parse_chain
+from .view import PatternView
+from .velocity import accent_levels
+
+# Largest time-signature numerator a MIDI meta event can hold, and so the
+# longest period a single-bar clip can have.
+MAX_NUMERATOR = 255
+# Steps evaluated per chunk, rounded down to whole bars. Memory stays bounded
+# by this rather than by the period.
+CHUNK_STEPS = 1 << 16
+
+
+def bar_steps(period, unit=1, limit=MAX_NUMERATOR):
+    """Largest divisor of period that is a whole number of unit-step beats, at most limit of them, or None.
+
+    Every bar of a long clip then has the same meter, and with unit 1 there is always one.
+    """
+    return max((d for d in range(unit, min(period, unit * limit) + 1, unit) if period % d == 0), default=None)
+
+
+def periodic_window(node, start, stop, period):
+    """Mask over [start, stop) of the node's segment over [0, period) repeated end to end.
+
+    The segment is what the in-memory path tiles, which differs from the
+    sieve itself when period is not a multiple of the sieve's own period.
+    """
+    offset = start % period
+    first = min(stop - start, period - offset)
+    mask = compute_mask(node, offset, offset + first)
+    while first < stop - start:
+        following = min(stop - start - first, period)
+        mask = np.concatenate([mask, compute_mask(node, 0, following)])
+        first += following
+    return mask
+
+
+def window_levels(accents, profile, start, stop, period):
+    """Velocity level of every step in [start, stop), before rests are silenced."""
+    labels = list(accents)
+    matrix = np.zeros((len(labels), stop - start), dtype=bool)
+    for row, label in enumerate(labels):
+        matrix[row] = periodic_window(accents[label], start, stop, period)
+    return accent_levels(labels, matrix, profile)
+
+
+def stream_shift_amounts(expression, period, direction='positive', zero=False):
+    """shift_amounts() for a long sieve, read from its onsets instead of a full-period binary."""
+    query = SieveQuery(expression)
+    if zero and direction in ('positive', 'negative', 'both') and query.contains(0):
+        yield 0
+    for onset in query.onsets_in(1, period):
+        if direction in ('positive', 'both'):
+            yield onset
+        if direction in ('negative', 'both'):
+            yield -onset
+
+
+def segment_rotation_period(expressions, period):
+    """A rotation period shared by the segments of the expressions over [0, period), without evaluating them.
+
+    The LCM of the simplified moduli is a period of every expression; when it
+    does not divide period the tiled segments do not repeat inside it.
+    """
+    q = math.lcm(*(sieve_period(simplify(expression)) for expression in expressions))
+    return q if period % q == 0 else period
+
+
+def variant_chunks(context, variant):
+    """Yield (binary, velocities) of a variant in whole-bar chunks, matching the in-memory transformations and shifts.
+
+    Every variant is a PatternView over the period (a shift amount is a
+    rolled view), so each chunk's output positions are mapped back to
+    positions in the period and looked up in the sieve directly.
+    """
+    period, bar = context['period'], context['bar']
+    chunk = bar * max(1, CHUNK_STEPS // bar)
+    sieve = simplify(context['sieve'])
+    accents = {label: simplify(expression) for label, expression in context['accents'].items()}
+
+    if isinstance(variant, int):
+        view = PatternView(period).rolled(variant)
+        accent_shift = variant if context['rotate_accents'] else 0
+    else:
+        view = chain_view(parse_chain(variant), period)
+        accent_shift = 0
+
+    for start in range(0, len(view), chunk):
+        stop = min(start + chunk, len(view))
+        binary = contains_many(sieve, view.positions(start, stop))
+        if view.inverted:
+            binary = ~binary
+        levels = window_levels(accents, context['profile'], start - accent_shift, stop - accent_shift, period)
+        yield binary.astype(int), np.where(binary, levels, 0)
@@ -0,0 +1,49 @@
+import re
+
+from .view import PatternView
+
+# Steps of a chain are joined with the composition sign or, in filenames and
+# plain-ASCII configs, with a dot: 'reverse∘stretch_3∘shift(+5)' is
+# 'reverse.stretch_3.shift(+5)' and applies shift(+5) first.
+CHAIN_SEPARATOR = re.compile(r'\s*[∘.]\s*')
+
+
+def chain_name(name):
+    """ASCII spelling of a transformation chain, as used in clip filenames."""
+    return '.'.join(CHAIN_SEPARATOR.split(name.strip()))
+
+
+def parse_chain(name):
+    """(operation, argument) steps of a chain in the order they apply, right to left."""
+    steps = []
+    for part in reversed(CHAIN_SEPARATOR.split(name.strip())):
+        stretch = re.fullmatch(r'stretch_(\d+)', part)
+        shift = re.fullmatch(r'shift\(([+-]?\d+)\)', part)
+        if part in ('prime', 'invert', 'reverse'):
+            steps.append((part, None))
+        elif stretch:
+            steps.append(('stretch', int(stretch.group(1))))
+        elif shift:
+            steps.append(('shift', int(shift.group(1))))
+        else:
+            raise ValueError(f"Unknown transformation: {name}")
+    if len(steps) == 1 and steps[0][0] == 'shift':
+        # Its clip would take the name of the apply_shift clip of the same amount.
+        raise ValueError(f"A lone {name} is not a transformation; shifts come from apply_shift")
+    return steps
+
+
+def chain_view(steps, length):
+    """The chain as a PatternView over an input of the given length."""
+    view = PatternView(length)
+    for operation, argument in steps:
+        if operation == 'invert':
+            view = view.inverted_view()
+        elif operation == 'reverse':
+            view = view.reversed()
+        elif operation == 'stretch':
+            view = view.stretched(argument)
+        elif operation == 'shift':
+            view = view.rolled(argument)
+    return view
+
@@ -0,0 +1,86 @@
+import numpy as np
+
+from .pattern import Pattern
+
+# Above this many accent labels the 2^k lookup table outgrows the pattern itself,
+# so velocities are reduced from per-step counts instead.
+MAX_TABLE_LABELS = 16
+
+
+def accent_bitmask(matrix):
+    """Per-step bitmask with bit j set where accent row j is active."""
+    weights = np.left_shift(1, np.arange(len(matrix), dtype=np.int64))
+    return weights @ matrix.astype(np.int64)
+
+
+def velocity_table(labels, profile):
+    """Velocity for every accent bitmask: gap, the single label's level, or overlap."""
+    table = np.full(1 << len(labels), profile['overlap'] if len(labels) > 1 else 0, dtype=int)
+    table[0] = profile['gap']
+    for bit, label in enumerate(labels):
+        table[1 << bit] = profile.get(label, profile['gap'])
+    return table
+
+
+def accent_levels(labels, matrix, profile):
+    """Velocity per step, before silencing rests."""
+    if len(labels) <= MAX_TABLE_LABELS:
+        return velocity_table(labels, profile)[accent_bitmask(matrix)]
+
+    counts = matrix.sum(axis=0)
+    singles = np.array([profile.get(label, profile['gap']) for label in labels], dtype=int)
+    levels = np.where(counts == 1, singles[matrix.argmax(axis=0)], profile['gap'])
+    return np.where(counts > 1, profile['overlap'], levels)
+
+
+def accent_layers(accent_binaries, length):
+    """Accent binaries or Patterns as Patterns over [0, length), tiling each as arr[i % len(arr)]."""
+    labels = list(accent_binaries)
+    layers = []
+    for label in labels:
+        accent = accent_binaries[label]
+        if not isinstance(accent, Pattern) or len(accent) != length:
+            accent = accent.to_binary() if isinstance(accent, Pattern) else np.asarray(accent) != 0
+            accent = Pattern.from_binary(np.resize(accent, length)) if len(accent) else Pattern.zeros(length)
+        layers.append(accent)
+    return labels, layers
+
+
+def layer_bitmask(layers, length):
+    """Per-step bitmask with bit j set where accent layer j is set; empty layers are skipped by popcount."""
+    bitmask = np.zeros(length, dtype=np.int64)
+    for bit, layer in enumerate(layers):
+        if layer.popcount():
+            bitmask |= layer.to_binary() << bit
+    return bitmask
+
+
+def layer_levels(labels, layers, profile, length):
+    """Velocity per step from accent Patterns, before silencing rests."""
+    if len(labels) <= MAX_TABLE_LABELS:
+        return velocity_table(labels, profile)[layer_bitmask(layers, length)]
+
+    # Steps set in at least one layer and in at least two, a word at a time.
+    once, twice = Pattern.zeros(length), Pattern.zeros(length)
+    for layer in layers:
+        twice |= once & layer
+        once |= layer
+    levels = np.where(twice.to_binary(), profile['overlap'], profile['gap'])
+    alone = once & ~twice
+    for label, layer in zip(labels, layers):
+        if layer.overlap(alone):
+            levels[(layer & alone).nonzero()] = profile.get(label, profile['gap'])
+    return levels
+
+
+def step_levels(accent_binaries, profile, length):
+    """Velocity level of every step over [0, length), before rests are silenced."""
+    labels, layers = accent_layers(accent_binaries, length)
+    return layer_levels(labels, layers, profile, length)
+
+
+def apply_levels(binary, levels):
+    """Velocities for a binary whose accent levels repeat every len(levels) steps."""
+    binary = np.asarray(binary)
+    return np.where(binary != 0, np.resize(levels, binary.shape[-1]), 0)
+
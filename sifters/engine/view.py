@@ -0,0 +1,69 @@
+import numpy as np
+
+from .pattern import Pattern
+
+
+class PatternView:
+    """Rotation, reversal and stride-repeat of a length-size base as metadata.
+
+    Step i of the view reads base[(offset + step * ((i + phase) // repeat)) % size],
+    with step +1 or -1 and 0 <= phase < repeat. Every operation returns a new
+    view in O(1), so any number of variants can share one base array; only
+    take() gathers, and it is meant to run at encode time.
+    """
+
+    __slots__ = ('size', 'offset', 'step', 'repeat', 'phase', 'inverted')
+
+    def __init__(self, size, offset=0, step=1, repeat=1, phase=0, inverted=False):
+        quotient, phase = divmod(phase, repeat)
+        self.size = size
+        self.offset = (offset + step * quotient) % size if size else 0
+        self.step = step
+        self.repeat = repeat
+        self.phase = phase
+        self.inverted = inverted
+
+    def __len__(self):
+        return self.size * self.repeat
+
+    def __eq__(self, other):
+        return isinstance(other, PatternView) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'PatternView({fields})'
+
+    def replace(self, **changes):
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return PatternView(**fields)
+
+    def rolled(self, amount):
+        """The view np.roll(view, amount) would give."""
+        return self.replace(phase=self.phase - amount)
+
+    def reversed(self):
+        return self.replace(step=-self.step, phase=self.repeat - self.phase)
+
+    def stretched(self, factor):
+        """Every step repeated factor times, as np.repeat does."""
+        return self.replace(repeat=self.repeat * factor, phase=self.phase * factor)
+
+    def inverted_view(self):
+        return self.replace(inverted=not self.inverted)
+
+    def positions(self, start=0, stop=None):
+        """Base indices read by steps [start, stop) of the view."""
+        stop = len(self) if stop is None else stop
+        steps = np.arange(start, stop, dtype=np.int64)
+        if not self.size:
+            return steps
+        return (self.offset + self.step * ((steps + self.phase) // self.repeat)) % self.size
+
+    def take(self, base):
+        """Materialize the view over base, an array or a Pattern; inversion flips binaries as 1 - x."""
+        if not isinstance(base, Pattern):
+            base = np.asarray(base)
+        gathered = base[self.positions()]
+        return 1 - gathered if self.inverted else gathered
@@ -0,0 +1,91 @@
+TITLE = 'starbird'
+
+# Every instrument is evaluated over the largest period in the set.
+SHARED_PERIOD = True
+
+# The original script's clip names: the title up front, and shifts numbered by onset index from 1.
+CLIP_NAME = '{title}_{name}_{variant}'
+SHIFT_NAME = '{title}_{name}_shift_clip{n}'
+
+INSTRUMENT_CONFIGS = [
+    {
+        'name': 'snare',
+        'sieve': '(8@0|8@1|8@7)&(5@1|5@3)|((8@0|8@1|8@2)&5@0)|((8@5|8@6)&(5@2|5@3|5@4))',
+        'velocity_profile': {'gap': 127, 'primary': 95, 'secondary': 63, 'overlap': 31},
+        'accent_dict': {
+            'primary': '5@0|5@2|5@1|5@3',
+            'secondary': '8@0|8@1|8@2|8@5|8@6|8@7'
+        },
+        'duration': 'Sixteenth Note',
+        'note': 64,
+        'transformations': ['invert', 'reverse', 'stretch_2'],
+        'apply_shift': True,
+        'shift_direction': 'positive',
+        'zero_shift': True,
+        'rotate_accents': False
+    },
+    {
+        'name': 'clap',
+        'sieve': '(((8@0|8@1|8@7)&(5@1|5@3))|((8@0|8@1|8@2)&5@0)|((8@5|8@6)&(5@2|5@3|5@4))|(8@6&5@1)|(8@3)|(8@4)|(8@1&5@2))',
+        'velocity_profile': {'gap': 127, 'primary': 95, 'secondary': 63, 'overlap': 31},
+        'accent_dict': {
+            'primary': '5@0|5@1|5@2|5@3|5@4',
+            'secondary': '8@0|8@1|8@2|8@3|8@4|8@5|8@6|8@7'
+        },
+        'duration': 'Sixteenth Note',
+        'note': 64,
+        'transformations': ['invert', 'reverse', 'stretch_2'],
+        'apply_shift': True,
+        'shift_direction': 'positive',
+        'zero_shift': True,
+        'rotate_accents': False
+    },
+    {
+        'name': 'kick',
+        'sieve': '(8@3)|(8@4)',
+        'velocity_profile': {'gap': 127, 'primary': 63, 'secondary': 95, 'overlap': 31},
+        'accent_dict': {
+            'primary': '(8@3)',
+            'secondary': '(8@4)'
+        },
+        'duration': 'Sixteenth Note',
+        'note': 64,
+        'transformations': ['invert', 'reverse', 'stretch_2'],
+        'apply_shift': True,
+        'shift_direction': 'positive',
+        'zero_shift': True,
+        'rotate_accents': False
+    },
+    {
+        'name': 'woodblock',
+        'sieve': '(8@1&5@2)',
+        'velocity_profile': {'gap': 127, 'primary': 95, 'secondary': 63, 'overlap': 31},
+        'accent_dict': {
+            'primary': '5@2',
+            'secondary': '8@1'
+        },
+        'duration': 'Sixteenth Note',
+        'note': 64,
+        'transformations': ['invert', 'reverse', 'stretch_2'],
+        'apply_shift': True,
+        'shift_direction': 'positive',
+        'zero_shift': True,
+        'rotate_accents': False
+    },
+    {
+        'name': 'impact',
+        'sieve': '(8@6&5@1)',
+        'velocity_profile': {'gap': 127, 'primary': 95, 'secondary': 63, 'overlap': 31},
+        'accent_dict': {
+            'primary': '5@1',
+            'secondary': '8@6',
+        },
+        'duration': 'Sixteenth Note',
+        'note': 64,
+        'transformations': ['invert', 'reverse', 'stretch_2'],
+        'apply_shift': True,
+        'shift_direction': 'positive',
+        'zero_shift': True,
+        'rotate_accents': False
+    },
+]
@@ -1,24 +1,4 @@
 TITLE = 'third'
-OUTPUT_DIR = f'sifters/{TITLE}/mid/'
-TICKS_PER_QUARTER_NOTE = 480
-
-DURATION_MULTIPLIER_KEY = {
-    'Whole Note': 4,
-    'Half Note': 2,
-    'Quarter Note': 1,
-    'Eighth Note': 0.5,
-    'Sixteenth Note': 0.25,
-    'Thirty-Second Note': 0.125,
-}
-
-DURATION_TO_DENOMINATOR = {
-    'Whole Note': 1,
-    'Half Note': 2,
-    'Quarter Note': 4,
-    'Eighth Note': 8,
-    'Sixteenth Note': 16,
-    'Thirty-Second Note': 16  # This stays 16; your code handles halving numerator
-}
 
 INSTRUMENT_CONFIGS = [
     {
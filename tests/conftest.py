@@ -0,0 +1,11 @@
+import pytest
+
+from tracks import folder, manifest, render, write_track
+
+
+@pytest.fixture
+def reference(tmp_path):
+    """Outputs of a plain run of the test track, and its manifest."""
+    directory = write_track(tmp_path / 'reference')
+    render(directory)
+    return folder(directory), manifest(directory)
@@ -0,0 +1,12 @@
+import numpy as np
+import pytest
+
+from sifters.engine.algebra import simplify
+from sifters.engine.sieve import evaluate
+from tracks import track_expressions
+
+
+@pytest.mark.parametrize('expression, period', list(track_expressions()))
+def test_simplified_sieve_has_the_same_mask(expression, period):
+    np.testing.assert_array_equal(evaluate(simplify(expression), -period, 2 * period),
+                                  evaluate(expression, -period, 2 * period))
@@ -0,0 +1,54 @@
+import io
+import json
+
+import pytest
+
+from tracks import folder, render, write_track
+
+
+@pytest.mark.parametrize('bundle', ['instrument', 'track'])
+def test_every_variant_is_a_track_matching_its_loose_clip(tmp_path, capsys, reference, bundle):
+    files, entries = reference
+    capsys.readouterr()
+    directory = write_track(tmp_path / 'track')
+    render(directory, bundle=bundle, bundle_index=True)
+    assert 'copied 2 duplicates' in capsys.readouterr().out
+
+    bundled = folder(directory)
+    owners = ['Test'] if bundle == 'track' else ['A', 'B']
+    assert sorted(bundled) == sorted([f'{owner}.mid' for owner in owners] + [f'{owner}.index.json' for owner in owners])
+    tracks = {}
+    for owner in owners:
+        data = bundled[f'{owner}.mid']
+        index = json.loads(bundled[f'{owner}.index.json'])
+        assert int.from_bytes(data[10:12], 'big') == len(index)
+        for name, entry in index.items():
+            tracks[f'{name}.mid'] = data[entry['offset']:entry['offset'] + entry['length']]
+            target = entries[f'{name}.mid'].get('alias')
+            assert entry.get('alias') == (target and target[:-len('.mid')])
+    assert tracks == {name: data[14:] for name, data in files.items()}
+
+
+@pytest.mark.parametrize('bundle', ['instrument', 'track'])
+def test_bundle_tracks_are_named_after_their_variants(tmp_path, bundle):
+    mido = pytest.importorskip('mido')
+    directory = write_track(tmp_path / 'track')
+    render(directory, bundle=bundle)
+    for name, data in folder(directory).items():
+        midi = mido.MidiFile(file=io.BytesIO(data))
+        assert midi.type == 1
+        names = [track.name for track in midi.tracks]
+        assert len(set(names)) == len(names) and all(track.startswith(('A_', 'B_')) for track in names)
+
+
+def test_switching_layouts_incrementally_matches_fresh_runs(tmp_path, reference):
+    directory = write_track(tmp_path / 'track')
+    bundled = write_track(tmp_path / 'bundled')
+    render(bundled, bundle='instrument', bundle_index=True)
+
+    render(directory)
+    render(directory, incremental=True, bundle='instrument')
+    render(directory, incremental=True, bundle='instrument', bundle_index=True)
+    assert folder(directory) == folder(bundled)
+    render(directory, incremental=True)
+    assert folder(directory) == reference[0]
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from sifters.engine import pipeline
+from sifters.engine.manifest import JOURNAL_NAME
+from tracks import CONFIG, folder, manifest, render, write_track
+
+
+def test_incremental_run_keeps_unchanged_clips(tmp_path, reference):
+    directory = write_track(tmp_path / 'track')
+    render(directory, incremental=True)
+    before = {name: os.stat(os.path.join(directory, 'mid', name)).st_mtime_ns for name in folder(directory)}
+
+    render(directory, incremental=True)
+    assert folder(directory) == reference[0]
+    assert before == {name: os.stat(os.path.join(directory, 'mid', name)).st_mtime_ns for name in folder(directory)}
+
+    changed_config = CONFIG.replace("'note': 60", "'note': 61")
+    write_track(tmp_path / 'track', changed_config)
+    render(directory, incremental=True)
+    changed = [name for name, data in folder(directory).items() if data != reference[0].get(name)]
+    assert changed and all(name.startswith('A_') for name in changed)
+    fresh = write_track(tmp_path / 'fresh', changed_config)
+    render(fresh)
+    assert folder(directory) == folder(fresh)
+
+
+def crash_after(monkeypatch, count):
+    """Make rendering raise once count clips have been rendered; returns a function that undoes it."""
+    render_variant = pipeline.render_variant
+    calls = []
+
+    def crashing(*args):
+        calls.append(args)
+        if len(calls) > count:
+            raise RuntimeError('crash')
+        return render_variant(*args)
+
+    monkeypatch.setattr(pipeline, 'render_variant', crashing)
+    return lambda: monkeypatch.setattr(pipeline, 'render_variant', render_variant)
+
+
+# A's fourth clip is stretch_2 and its sixth, which the crash cuts off, a duplicate of it.
+DUPLICATE = CONFIG.replace("'reverse∘shift(+3)']", "'reverse∘shift(+3)', 'stretch_2.prime']")
+
+
+@pytest.mark.parametrize('config', [CONFIG, DUPLICATE], ids=['plain', 'duplicate'])
+def test_resume_restores_the_same_folder(tmp_path, monkeypatch, config):
+    fresh = write_track(tmp_path / 'fresh', config)
+    render(fresh)
+    directory = write_track(tmp_path / 'track', config)
+    restore = crash_after(monkeypatch, 5)
+    with pytest.raises(RuntimeError):
+        render(directory)
+    assert os.path.exists(os.path.join(directory, 'mid', JOURNAL_NAME))
+
+    restore()
+    render(directory, resume=True)
+    assert folder(directory) == folder(fresh)
+    assert manifest(directory) == manifest(fresh)
+    assert not os.path.exists(os.path.join(directory, 'mid', JOURNAL_NAME))
+
+
+def test_resume_renders_again_a_finished_clip_whose_rename_was_lost(tmp_path, monkeypatch, reference):
+    directory = write_track(tmp_path / 'track')
+    restore = crash_after(monkeypatch, 5)
+    with pytest.raises(RuntimeError):
+        render(directory)
+    # As after a power loss that kept the journal line but not the rename: the name holds an older clip.
+    path = os.path.join(directory, 'mid', 'A_invert.mid')
+    with open(path, 'wb') as f:
+        f.write(reference[0]['A_prime.mid'])
+
+    restore()
+    render(directory, resume=True)
+    assert folder(directory) == reference[0]
+    assert manifest(directory) == reference[1]
@@ -0,0 +1,61 @@
+import io
+
+import numpy as np
+import pytest
+
+from sifters.engine.midi import clip_template, stream_clip
+from sifters.engine.pipeline import create_midi
+
+mido = pytest.importorskip('mido')
+
+RNG = np.random.default_rng(3)
+
+
+def mido_clip(binary, filename, velocities, note, step_ticks, time_signature, ticks_per_beat):
+    """A clip built the way the original scripts built it, with mido."""
+    mid = mido.MidiFile(ticks_per_beat=ticks_per_beat)
+    track = mido.MidiTrack()
+    mid.tracks.append(track)
+    track.append(mido.MetaMessage('track_name', name=filename, time=0))
+    numerator, denominator = time_signature
+    track.append(mido.MetaMessage('time_signature', numerator=numerator, denominator=denominator, time=0))
+    accumulated_time = 0
+    for value, velocity in zip(binary, velocities):
+        if value:
+            track.append(mido.Message('note_on', note=note, velocity=int(velocity), time=accumulated_time))
+            track.append(mido.Message('note_off', note=note, velocity=0, time=step_ticks))
+            accumulated_time = 0
+        else:
+            accumulated_time += step_ticks
+    f = io.BytesIO()
+    mid.save(file=f)
+    return f.getvalue()
+
+
+@pytest.mark.parametrize('length, density, step_ticks, time_signature', [
+    (1, 1, 480, (1, 4)),
+    (16, 0.5, 120, (2, 16)),
+    (97, 0.2, 60, (97, 16)),
+    (255, 0.01, 1920, (255, 1)),
+    (200, 0.005, 40000, (25, 8)),
+])
+def test_matches_mido(length, density, step_ticks, time_signature):
+    template = clip_template(time_signature, 480)
+    for _ in range(5):
+        binary = (RNG.random(length) < density).astype(int)
+        binary[RNG.integers(length)] = 1
+        velocities = np.where(binary, RNG.integers(1, 128, length), 0)
+        note = int(RNG.integers(128))
+        expected = mido_clip(binary, 'clip name', velocities, note, step_ticks, time_signature, 480)
+        assert create_midi(binary, 'clip name', velocities, note, step_ticks, template) == expected
+
+        f = io.BytesIO()
+        chunks = [(binary[i:i + 7], velocities[i:i + 7]) for i in range(0, length, 7)]
+        assert stream_clip(f, chunks, note, step_ticks, 'clip name', template) == np.count_nonzero(velocities)
+        assert f.getvalue() == expected
+
+
+def test_silent_clips_are_skipped():
+    template = clip_template((4, 4), 480)
+    assert create_midi(np.zeros(8, dtype=int), 'rest', np.zeros(8, dtype=int), 60, 480, template) is None
+    assert create_midi(np.ones(8, dtype=int), 'rest', np.zeros(8, dtype=int), 60, 480, template) is None
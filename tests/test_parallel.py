@@ -0,0 +1,7 @@
+from tracks import folder, render, write_track
+
+
+def test_parallel_run_matches_serial(tmp_path, reference):
+    directory = write_track(tmp_path / 'track')
+    render(directory, jobs=2, writers=2)
+    assert folder(directory) == reference[0]
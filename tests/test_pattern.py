@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from sifters.engine.pattern import Pattern
+from sifters.engine.velocity import MAX_TABLE_LABELS, accent_levels, step_levels
+from sifters.engine.view import PatternView
+
+RNG = np.random.default_rng(11)
+LENGTHS = [1, 5, 63, 64, 65, 130, 200]
+
+
+def random_binary(length):
+    return RNG.integers(0, 2, length)
+
+
+@pytest.mark.parametrize('length', LENGTHS)
+def test_operations_match_numpy(length):
+    for _ in range(5):
+        binary = random_binary(length)
+        pattern = Pattern.from_binary(binary)
+        np.testing.assert_array_equal(pattern.to_binary(), binary)
+        for amount in [-length - 3, -65, -1, 0, 1, 63, 64, 2 * length + 1]:
+            np.testing.assert_array_equal(pattern.shift(amount).to_binary(), np.roll(binary, amount))
+        np.testing.assert_array_equal(pattern.reverse().to_binary(), binary[::-1])
+        np.testing.assert_array_equal(pattern.invert().to_binary(), 1 - binary)
+        for factor in [1, 2, 3]:
+            np.testing.assert_array_equal(pattern.stretch(factor).to_binary(), np.repeat(binary, factor))
+        # Every result keeps the bits past its length clear, so equal binaries give equal Patterns.
+        assert pattern.invert().invert() == pattern
+        assert pattern.shift(length) == pattern
+
+
+@pytest.mark.parametrize('length', LENGTHS)
+def test_bitwise_and_counts_match_numpy(length):
+    a, b = random_binary(length), random_binary(length)
+    x, y = Pattern.from_binary(a), Pattern.from_binary(b)
+    np.testing.assert_array_equal((x & y).to_binary(), a & b)
+    np.testing.assert_array_equal((x | y).to_binary(), a | b)
+    np.testing.assert_array_equal((x ^ y).to_binary(), a ^ b)
+    np.testing.assert_array_equal(x.nonzero(), np.flatnonzero(a))
+    assert x.popcount() == a.sum()
+    assert x.overlap(y) == (a & b).sum()
+    with pytest.raises(ValueError):
+        x & Pattern.zeros(length + 1)
+
+
+@pytest.mark.parametrize('length', LENGTHS)
+def test_indexing_wraps_like_the_binary(length):
+    binary = random_binary(length)
+    pattern = Pattern.from_binary(binary)
+    indices = np.arange(-2 * length, 3 * length)
+    np.testing.assert_array_equal(pattern[indices], binary[indices % length])
+    assert pattern[length + 2] == binary[2 % length]
+    view = PatternView(length).reversed().stretched(3).rolled(4)
+    np.testing.assert_array_equal(view.take(pattern), view.take(binary))
+
+
+def test_empty_pattern():
+    pattern = Pattern.from_binary([])
+    assert len(pattern) == 0 and pattern.popcount() == 0
+    assert pattern.shift(3) == pattern == pattern.reverse()
+    with pytest.raises(IndexError):
+        pattern[0]
+    assert len(pattern[np.arange(0)]) == 0
+
+
+def test_read_only_words_are_left_alone():
+    words = Pattern.from_binary(random_binary(100)).words
+    words.flags.writeable = False
+    pattern = Pattern(words, 100)
+    assert pattern.invert().invert() == pattern
+    assert pattern.shift(7).shift(-7) == pattern
+
+
+@pytest.mark.parametrize('count', [0, 1, 3, MAX_TABLE_LABELS, MAX_TABLE_LABELS + 3])
+def test_layer_levels_match_the_accent_matrix(count):
+    length = 150
+    accents = {f'l{i}': random_binary(RNG.integers(1, length)) for i in range(count)}
+    profile = {'gap': 5, 'overlap': 120, **{label: 10 + i for i, label in enumerate(accents)}}
+    matrix = np.array([np.resize(accent, length) for accent in accents.values()], dtype=bool).reshape(count, length)
+    expected = accent_levels(list(accents), matrix, profile)
+    patterns = {label: Pattern.from_binary(np.resize(accent, length)) for label, accent in accents.items()}
+    np.testing.assert_array_equal(step_levels(accents, profile, length), expected)
+    np.testing.assert_array_equal(step_levels(patterns, profile, length), expected)
@@ -0,0 +1,55 @@
+import io
+import itertools
+
+import pytest
+
+from sifters.engine import pipeline
+from sifters.engine.midi import HEADER_LENGTH, rename_track
+from tracks import CONFIG, folder, render, write_track
+
+
+def test_aliases_are_the_clips_they_stand_for(tmp_path, monkeypatch, reference):
+    files, entries = reference
+    assert sorted(files) == sorted(entries)
+    assert any('alias' in entry for entry in entries.values())
+    for name, entry in entries.items():
+        assert 'alias' not in entries[entry.get('alias', name)]
+
+    # With every clip unique and every rotation distinct, each clip is encoded for itself.
+    keys = itertools.count()
+    monkeypatch.setattr(pipeline, 'clip_key', lambda *args: str(next(keys)))
+    monkeypatch.setattr(pipeline, 'rotation_period', len)
+    directory = write_track(tmp_path / 'track')
+    render(directory)
+    assert folder(directory) == files
+
+
+def test_clips_are_named_after_their_files(reference):
+    mido = pytest.importorskip('mido')
+    for name, data in reference[0].items():
+        assert mido.MidiFile(file=io.BytesIO(data)).tracks[0].name == name[:-len('.mid')]
+
+
+def test_clip_and_shift_names_follow_the_track(tmp_path, reference):
+    config = CONFIG.replace("'apply_shift': True}", "'apply_shift': True, 'zero_shift': True}") + (
+        "CLIP_NAME = '{title}_{name}_{variant}'\nSHIFT_NAME = '{title}_{name}_shift_clip{n}'\n")
+    directory = write_track(tmp_path / 'track', config)
+    render(directory)
+    files = folder(directory)
+    expected = {}
+    for name, data in reference[0].items():
+        name = 'Test_' + name.replace('_shift(', '_shift_clip(')
+        if '_shift_clip(' in name:
+            amount = int(name[name.index('(') + 1:name.index(')')])
+            name = name[:name.index('(')] + f'{amount + 1}.mid'
+        expected[name] = data
+    expected['Test_A_shift_clip1.mid'] = reference[0]['A_prime.mid']
+    assert sorted(files) == sorted(expected)
+    for name, data in expected.items():
+        assert files[name] == data[:HEADER_LENGTH] + rename_track(data[HEADER_LENGTH:], name[:-len('.mid')])
+
+
+def test_clip_names_are_checked(tmp_path):
+    directory = write_track(tmp_path / 'track', CONFIG + "SHIFT_NAME = '{name}_{step}'\n")
+    with pytest.raises(ValueError, match='SHIFT_NAME'):
+        pipeline.load_track(directory)
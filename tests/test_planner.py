@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from sifters.engine.planner import SievePlan
+from sifters.engine.sieve import evaluate
+from tracks import track_expressions
+
+
+def expressions_by_period():
+    periods = {}
+    for param in track_expressions():
+        expression, period = param.values
+        periods.setdefault(period, []).append(expression)
+    return periods
+
+
+@pytest.mark.parametrize('period, expressions', sorted(expressions_by_period().items()))
+def test_plan_matches_each_sieve(period, expressions):
+    masks = SievePlan(expressions).evaluate(0, period)
+    for expression in expressions:
+        np.testing.assert_array_equal(masks[expression], evaluate(expression, 0, period))
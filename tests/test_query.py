@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from sifters.engine.query import SieveQuery
+from sifters.engine.sieve import evaluate
+
+EXPRESSIONS = [
+    '3@1|4@0',
+    '(8@0|8@3|12@5)&-(3@0)',
+    '-(3@1|4@0)',
+    '(5@2^7@1)|11@4',
+    '1009@3|1013@1',
+    '(999983@0|7@2)&-(5@2)',
+    '0@0',
+]
+
+
+@pytest.mark.parametrize('expression', EXPRESSIONS)
+def test_queries_match_brute_force(expression):
+    query = SieveQuery(expression)
+    start, stop = -3000, 3000
+    onsets = (np.flatnonzero(evaluate(expression, start, stop)) + start).tolist()
+
+    assert list(query.onsets_in(start, stop)) == onsets
+    assert list(query.onsets_in(17, 923)) == [onset for onset in onsets if 17 <= onset < 923]
+    for t in range(-200, 200, 7):
+        assert query.contains(t) == (t in onsets)
+        expected = next((onset for onset in onsets if onset >= t), None)
+        assert query.next_onset(t) == expected
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from sifters.engine.shifts import distinct_shifts, rotation_period, shift_amounts
+from sifters.engine.sieve import sieve_to_binary
+from sifters.engine.streaming import segment_rotation_period, stream_shift_amounts
+
+RNG = np.random.default_rng(13)
+
+
+def brute_rotation_period(sequence):
+    return next(q for q in range(1, len(sequence) + 1) if np.array_equal(np.roll(sequence, q), sequence))
+
+
+def sequences():
+    for length in [1, 2, 6, 24, 60]:
+        for repeats in [1, 2, 3, 4]:
+            yield np.tile(RNG.integers(0, 2, length), repeats)
+            yield np.tile(RNG.integers(0, 3, length), repeats)
+    yield np.zeros(12, dtype=int)
+    yield np.array([1, 0, 1, 0, 1])
+
+
+def test_rotation_period_matches_np_roll():
+    for sequence in sequences():
+        assert rotation_period(sequence) == brute_rotation_period(sequence)
+    assert rotation_period([]) == 1
+
+
+@pytest.mark.parametrize('direction', ['positive', 'negative', 'both'])
+def test_distinct_shifts_keep_one_clip_per_rotation(direction):
+    for sequence in sequences():
+        amounts = shift_amounts(sequence, direction, zero=True)
+        kept, aliases = distinct_shifts(amounts, rotation_period(sequence))
+        assert sorted(kept + list(aliases)) == sorted(map(int, amounts))
+        clips = [np.roll(sequence, amount).tobytes() for amount in kept]
+        assert len(set(clips)) == len(clips)
+        assert sequence.tobytes() not in clips
+        for amount, target in aliases.items():
+            assert np.array_equal(np.roll(sequence, amount), np.roll(sequence, 0 if target == 'prime' else target))
+
+
+@pytest.mark.parametrize('direction', ['positive', 'negative', 'both'])
+@pytest.mark.parametrize('zero', [False, True])
+def test_shift_amounts(direction, zero):
+    for expression, period in [('8@0|8@3|12@5', 24), ('8@3|12@5', 24), ('7@0', 7)]:
+        onsets = np.flatnonzero(sieve_to_binary(expression, period))
+        expected = [0] if zero and onsets[0] == 0 else []
+        for onset in onsets[onsets != 0]:
+            expected += {'positive': [onset], 'negative': [-onset], 'both': [onset, -onset]}[direction]
+        binary = sieve_to_binary(expression, period)
+        assert list(shift_amounts(binary, direction, zero)) == expected
+        assert list(stream_shift_amounts(expression, period, direction, zero)) == expected
+
+
+@pytest.mark.parametrize('expressions, period', [
+    (['8@0|8@3|12@5'], 24),
+    (['8@0|8@3|12@5'], 48),
+    (['8@0|8@3|12@5', '4@0'], 30),
+    (['4@0|4@2', '3@1'], 36),
+])
+def test_segment_rotation_period_is_a_period(expressions, period):
+    q = segment_rotation_period(expressions, period)
+    assert period % q == 0
+    for expression in expressions:
+        segment = sieve_to_binary(expression, period)
+        assert np.array_equal(np.roll(segment, q), segment)
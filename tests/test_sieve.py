@@ -0,0 +1,14 @@
+import numpy as np
+import pytest
+
+from sifters.engine.sieve import music21_binary, sieve_to_binary
+from tracks import track_expressions
+
+EXPRESSIONS = list(track_expressions())
+
+
+@pytest.mark.parametrize('expression, period', EXPRESSIONS)
+def test_evaluator_matches_music21(expression, period):
+    pytest.importorskip('music21')
+    np.testing.assert_array_equal(sieve_to_binary(expression, period), music21_binary(expression, period))
+
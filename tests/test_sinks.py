@@ -0,0 +1,42 @@
+import errno
+import json
+import os
+import zipfile
+
+import pytest
+
+from sifters.engine import sinks
+from sifters.engine.manifest import JOURNAL_NAME, MANIFEST_NAME
+from tracks import folder, render, write_track
+
+
+def test_zip_sink_holds_the_loose_files(tmp_path, reference):
+    directory = write_track(tmp_path / 'track')
+    render(directory, sink='zip')
+    with zipfile.ZipFile(os.path.join(directory, 'mid', 'Test.zip')) as archive:
+        members = {name: archive.read(name) for name in archive.namelist()}
+    assert json.loads(members.pop(MANIFEST_NAME)) == reference[1]
+    # An archive only holds the written clips; its manifest maps the aliases to them.
+    assert members == {name: data for name, data in reference[0].items() if 'alias' not in reference[1][name]}
+
+
+@pytest.mark.parametrize('writers', [0, 1, 2])
+def test_failed_write_stops_the_run_before_its_aliases(tmp_path, monkeypatch, reference, writers):
+    directory = write_track(tmp_path / 'track')
+    write_atomic = sinks.write_atomic
+
+    def full_disk(path, data):
+        if os.path.basename(path) == 'B_prime.mid':
+            raise OSError(errno.ENOSPC, 'No space left on device')
+        write_atomic(path, data)
+
+    monkeypatch.setattr(sinks, 'write_atomic', full_disk)
+    with pytest.raises(OSError) as error:
+        render(directory, writers=writers)
+    assert error.value.errno == errno.ENOSPC
+    assert not os.path.exists(os.path.join(directory, 'mid', MANIFEST_NAME))
+    assert os.path.exists(os.path.join(directory, 'mid', JOURNAL_NAME))
+
+    monkeypatch.setattr(sinks, 'write_atomic', write_atomic)
+    render(directory, resume=True)
+    assert folder(directory) == reference[0]
@@ -0,0 +1,50 @@
+import io
+
+import pytest
+
+from sifters.engine import pipeline, streaming
+from sifters.engine.midi import stream_clip
+from tracks import write_track
+
+
+@pytest.fixture
+def track(tmp_path):
+    return pipeline.load_track(write_track(tmp_path / 'track'))
+
+
+def test_streamed_clips_match_the_in_memory_ones(track, monkeypatch):
+    # One-step bars and three-step chunks, so every clip is written in several.
+    monkeypatch.setattr(streaming, 'CHUNK_STEPS', 3)
+    for config, period in zip(track.instrument_configs, pipeline.instrument_periods(track)):
+        context, arrays, variants = pipeline.plan_instrument(track, config, period)
+        streamed, streamed_variants = pipeline.plan_streamed_instrument(track, config, period)
+        assert streamed_variants == variants
+        assert streamed['time_signature'] == context['time_signature']
+        streamed['bar'] = 1
+        arrays = {f'0.{name}': array for name, array in arrays.items()}
+        for variant in variants:
+            filename, data, message, key = pipeline.render_variant([context], arrays, (0, variant))
+            chunks = list(streaming.variant_chunks(streamed, variant))
+            assert len(chunks) > 1
+            f = io.BytesIO()
+            stream_clip(f, chunks, streamed['note'], streamed['step_ticks'], filename, streamed['template'])
+            assert f.getvalue() == data, filename
+
+
+@pytest.mark.parametrize('period, duration, bar, time_signature', [
+    (257, 'Thirty-Second Note', 1, (1, 32)),
+    (514, 'Thirty-Second Note', 2, (1, 16)),
+    (1000, 'Thirty-Second Note', 500, (250, 16)),
+    (1000, 'Sixteenth Note', 250, (250, 16)),
+    (771, 'Quarter Note', 3, (3, 4)),
+])
+def test_streamed_bars_are_whole_beats(track, period, duration, bar, time_signature):
+    assert pipeline.streamed_time_signature(track, period, duration) == (bar, time_signature)
+
+
+def test_bar_steps():
+    for period in range(1, 600):
+        for unit in (1, 2):
+            bar = streaming.bar_steps(period, unit)
+            divisors = [d for d in range(unit, period + 1, unit) if period % d == 0 and d // unit <= 255]
+            assert bar == max(divisors, default=None)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from sifters.engine.transformations import chain_view, parse_chain
+
+RNG = np.random.default_rng(7)
+
+
+def numpy_step(pattern, operation, argument):
+    if operation == 'invert':
+        return 1 - pattern
+    if operation == 'reverse':
+        return pattern[::-1]
+    if operation == 'stretch':
+        return np.repeat(pattern, argument)
+    if operation == 'shift':
+        return np.roll(pattern, argument)
+    return pattern
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_random_chains_match_numpy(seed):
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 2, int(rng.integers(1, 24)))
+    steps = []
+    for _ in range(int(rng.integers(1, 6))):
+        operation = ['invert', 'reverse', 'stretch', 'shift'][int(rng.integers(4))]
+        argument = int(rng.integers(1, 4)) if operation == 'stretch' else int(rng.integers(-30, 30))
+        steps.append((operation, argument))
+
+    expected = base
+    for operation, argument in steps:
+        expected = numpy_step(expected, operation, argument)
+    np.testing.assert_array_equal(chain_view(steps, len(base)).take(base), expected)
+
+
+def test_chain_applies_right_to_left():
+    base = RNG.integers(0, 2, 12)
+    expected = np.roll(base, 5)
+    expected = np.repeat(expected, 3)[::-1]
+    for name in ['reverse∘stretch_3∘shift(+5)', 'reverse.stretch_3.shift(+5)']:
+        np.testing.assert_array_equal(chain_view(parse_chain(name), len(base)).take(base), expected)
+
+
+def test_lone_shift_is_not_a_transformation():
+    with pytest.raises(ValueError):
+        parse_chain('shift(+5)')
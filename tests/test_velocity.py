@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from sifters.engine import pipeline
+from sifters.engine.sieve import sieve_to_binary
+from sifters.engine.velocity import MAX_TABLE_LABELS, apply_levels, step_levels
+from tracks import TRACKS
+
+RNG = np.random.default_rng(5)
+
+
+def accent_velocity(binary, accent_binaries, profile):
+    """The per-step velocities of the original psappha, third and sixty scripts."""
+    velocities = np.zeros_like(binary, dtype=int)
+    for i in range(len(binary)):
+        active = [label for label, arr in accent_binaries.items() if arr[i % len(arr)]]
+        if not binary[i]:
+            velocities[i] = 0
+        elif len(active) > 1:
+            velocities[i] = profile['overlap']
+        elif len(active) == 1:
+            velocities[i] = profile.get(active[0], profile['gap'])
+        else:
+            velocities[i] = profile['gap']
+    return velocities
+
+
+def accent_velocity_with_patterns(binary, primary_binary, secondary_binary, profile):
+    """The per-step velocities of the original amen and starbird scripts."""
+    velocities = np.zeros(len(binary), dtype=int)
+    for i, value in enumerate(binary):
+        if value:
+            primary = primary_binary[i % len(primary_binary)]
+            secondary = secondary_binary[i % len(secondary_binary)]
+            if primary and secondary:
+                velocities[i] = profile['overlap']
+            elif primary:
+                velocities[i] = profile['primary']
+            elif secondary:
+                velocities[i] = profile['secondary']
+            else:
+                velocities[i] = profile['gap']
+    return velocities
+
+
+def velocities(binary, accent_binaries, profile):
+    return apply_levels(binary, step_levels(accent_binaries, profile, len(binary)))
+
+
+@pytest.mark.parametrize('count', [0, 1, 2, 5, MAX_TABLE_LABELS, MAX_TABLE_LABELS + 1, 24])
+def test_matches_accent_velocity(count):
+    for length in [1, 12, 97]:
+        binary = RNG.integers(0, 2, length)
+        accents = {f'l{i}': RNG.integers(0, 2, RNG.integers(1, 2 * length + 1)) for i in range(count)}
+        profile = {'gap': 3, 'overlap': 127, **{label: 20 + i for i, label in enumerate(accents)}}
+        # A label left out of the profile plays at the gap level.
+        profile.pop('l0', None)
+        np.testing.assert_array_equal(velocities(binary, accents, profile), accent_velocity(binary, accents, profile))
+
+
+def test_matches_accent_velocity_with_patterns():
+    profile = {'gap': 127, 'primary': 95, 'secondary': 63, 'overlap': 31}
+    for length in [1, 16, 40]:
+        binary = RNG.integers(0, 2, length)
+        primary, secondary = RNG.integers(0, 2, length), RNG.integers(0, 2, RNG.integers(1, length + 1))
+        expected = accent_velocity_with_patterns(binary, primary, secondary, profile)
+        accents = {'primary': primary, 'secondary': secondary}
+        np.testing.assert_array_equal(velocities(binary, accents, profile), expected)
+
+
+@pytest.mark.parametrize('name', TRACKS)
+def test_committed_tracks_keep_their_velocities(name):
+    track = pipeline.load_track(name)
+    for config, period in zip(track.instrument_configs, pipeline.instrument_periods(track)):
+        if pipeline.is_streamed(period):
+            continue
+        binary = sieve_to_binary(config['sieve'], period)
+        accents = pipeline.create_accent_binaries(config.get('accent_dict', {}), period)
+        profile = pipeline.instrument_profile(config)
+        np.testing.assert_array_equal(velocities(binary, accents, profile), accent_velocity(binary, accents, profile))
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from sifters.engine.view import PatternView
+
+RNG = np.random.default_rng(7)
+
+
+@pytest.mark.parametrize('length', [1, 7, 16, 31])
+def test_single_operations_match_numpy(length):
+    base = RNG.integers(0, 2, length)
+    view = PatternView(length)
+    for amount in [-length - 3, -1, 0, 1, 5, 2 * length + 1]:
+        np.testing.assert_array_equal(view.rolled(amount).take(base), np.roll(base, amount))
+    np.testing.assert_array_equal(view.reversed().take(base), base[::-1])
+    for factor in [1, 2, 3]:
+        np.testing.assert_array_equal(view.stretched(factor).take(base), np.repeat(base, factor))
+    np.testing.assert_array_equal(view.inverted_view().take(base), 1 - base)
@@ -0,0 +1,56 @@
+"""Throwaway tracks for the tests, and the sieves of the committed ones."""
+import json
+import os
+
+import pytest
+
+from sifters.engine import pipeline
+from sifters.engine.manifest import MANIFEST_NAME
+from sifters.engine.planner import config_expressions
+
+TRACKS = ['psappha', 'third', 'sixty', 'amen', 'starbird']
+
+CONFIG = '''
+TITLE = 'Test'
+INSTRUMENT_CONFIGS = [
+    {'name': 'A', 'sieve': '(8@0|8@3|12@5)', 'accent_dict': {'a': '4@0', 'b': '3@0'}, 'note': 60,
+     'transformations': ['invert', 'reverse', 'stretch_2', 'reverse∘shift(+3)'], 'apply_shift': True},
+    {'name': 'B', 'sieve': '4@0|4@2', 'duration': 'Eighth Note', 'transformations': ['reverse'],
+     'apply_shift': True, 'shift_direction': 'both'},
+]
+'''
+
+
+def write_track(directory, config=CONFIG):
+    directory.mkdir(exist_ok=True)
+    (directory / 'config.py').write_text(config)
+    return str(directory)
+
+
+def render(directory, **options):
+    track = pipeline.load_track(directory)
+    pipeline.run(track, **options)
+    return track
+
+
+def folder(directory):
+    """Bytes of every non-hidden file in a track's output folder."""
+    path = os.path.join(directory, 'mid')
+    return {name: open(os.path.join(path, name), 'rb').read() for name in sorted(os.listdir(path))
+            if not name.startswith('.')}
+
+
+def manifest(directory):
+    with open(os.path.join(directory, 'mid', MANIFEST_NAME)) as f:
+        return json.load(f)
+
+
+def track_expressions():
+    """(expression, period) of every sieve and accent of the committed tracks that is rendered in memory."""
+    for name in TRACKS:
+        track = pipeline.load_track(name)
+        for config, period in zip(track.instrument_configs, pipeline.instrument_periods(track)):
+            if pipeline.is_streamed(period):
+                continue
+            for index, expression in enumerate(config_expressions(config)):
+                yield pytest.param(expression, period, id=f"{name}-{config.get('name')}-{index}")